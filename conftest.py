@@ -11,6 +11,9 @@ from openpyxl import Workbook
 from datetime import datetime, date
 
 
+# Scenario, performance and permission fixtures live in tests/enhanced_conftest.py
+pytest_plugins = ["tests.enhanced_conftest"]
+
 # Test data directory paths
 TEST_DIR = Path(__file__).parent
 FIXTURES_DIR = TEST_DIR / "fixtures"
@@ -38,8 +38,11 @@ __url__ = "https://github.com/pgaljan/excel-dumper"
 from .dumper import (
     main,
     extract_excel_data,
+    iter_excel_data,
     write_to_csv,
+    dump_excel_to_csv,
     write_to_json,
+    dump_excel_to_json,
     find_newest_excel_file,
     generate_output_filename,
     has_non_null_data,
@@ -53,8 +56,11 @@ __all__ = [
     
     # Core data processing functions
     "extract_excel_data",
+    "iter_excel_data",
     "write_to_csv", 
+    "dump_excel_to_csv",
     "write_to_json",
+    "dump_excel_to_json",
     
     # Utility functions
     "find_newest_excel_file",
@@ -95,25 +101,39 @@ def quick_extract(filename, output_format='csv', include_row_numbers=False):
     if not Path(filename).exists():
         raise FileNotFoundError(f"Excel file not found: {filename}")
     
-    # Extract data
-    data = extract_excel_data(filename, include_row_numbers=include_row_numbers)
-    
-    if not data:
-        raise ValueError("No data found to export")
-    
     # Generate output filename
     output_file = generate_output_filename(filename, output_format=output_format)
     
-    # Write output
+    # Write output; rows stream straight from the workbook to the file
     if output_format == 'json':
-        write_to_json(data, output_file, include_row_numbers)
+        data = dump_excel_to_json(filename, output_file, include_row_numbers=include_row_numbers)
     else:
-        write_to_csv(data, output_file, include_row_numbers)
+        data = dump_excel_to_csv(filename, output_file, include_row_numbers=include_row_numbers)
+    
+    if not data:
+        raise ValueError("No data found to export")
     
     return output_file
 
 
-def batch_process(input_dir=".", output_dir=None, output_format='csv'):
+def export_file(filename, output_file, output_format='csv'):
+    """
+    Export one Excel file to output_file.
+    
+    Args:
+        filename (str): Path to Excel file
+        output_file (str): Path of the file to write
+        output_format (str): 'csv' or 'json'
+    
+    Returns:
+        int: Number of rows written (no file is created when this is 0)
+    """
+    if output_format == 'json':
+        return dump_excel_to_json(filename, output_file)
+    return dump_excel_to_csv(filename, output_file)
+
+
+def batch_process(input_dir=".", output_dir=None, output_format='csv', max_workers=None):
     """
     Process all Excel files in a directory.
     
@@ -121,40 +141,66 @@ def batch_process(input_dir=".", output_dir=None, output_format='csv'):
         input_dir (str): Directory to search for Excel files
         output_dir (str): Output directory (default: same as input)
         output_format (str): 'csv' or 'json'
+        max_workers (int): Number of files to process in parallel worker processes
     
     Returns:
         list: Paths to generated output files
     """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
     from pathlib import Path
-    import glob
+    from .dumper import excel_file_entries
     
-    search_path = Path(input_dir)
     output_files = []
     
-    # Find all Excel files
-    excel_files = []
-    for ext in DEFAULT_EXCEL_EXTENSIONS:
-        excel_files.extend(search_path.glob(f"*{ext}"))
+    # Find all Excel files in one directory read
+    try:
+        excel_files = [Path(entry.path) for entry in excel_file_entries(input_dir, tuple(DEFAULT_EXCEL_EXTENSIONS))]
+    except (FileNotFoundError, NotADirectoryError):
+        excel_files = []
     
     if not excel_files:
         raise FileNotFoundError(f"No Excel files found in directory: {input_dir}")
     
-    # Process each file
+    # Name every output up front, reserving each name so files exported at the
+    # same time cannot be given the same one
+    jobs = []
+    reserved = set()
     for excel_file in excel_files:
         try:
-            data = extract_excel_data(str(excel_file))
+            output_file = generate_output_filename(
+                str(excel_file), 
+                output_dir, 
+                output_format,
+                reserved
+            )
+        except Exception as e:
+            print(f"Warning: Could not process {excel_file}: {e}")
+            continue
+        reserved.add(output_file)
+        jobs.append((excel_file, output_file))
+    
+    # Files are independent, so they can be exported in separate processes;
+    # more workers than CPU cores or files would only add process start-up cost
+    workers = min(max_workers or 1, os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [
+                executor.submit(export_file, str(excel_file), output_file, output_format)
+                for excel_file, output_file in jobs
+            ]
+    else:
+        results = None
+    
+    # Process each file
+    for index, (excel_file, output_file) in enumerate(jobs):
+        try:
+            if results is None:
+                data = export_file(str(excel_file), output_file, output_format)
+            else:
+                data = results[index].result()
+            
             if data:
-                output_file = generate_output_filename(
-                    str(excel_file), 
-                    output_dir, 
-                    output_format
-                )
-                
-                if output_format == 'json':
-                    write_to_json(data, output_file)
-                else:
-                    write_to_csv(data, output_file)
-                
                 output_files.append(output_file)
                 
         except Exception as e:
@@ -210,12 +256,40 @@ def check_dependencies():
             'version': None
         }
     
+    # Optional: reads .xlsb files
+    try:
+        import pyxlsb
+        dependencies['pyxlsb'] = {
+            'available': True,
+            'version': getattr(pyxlsb, '__version__', None)
+        }
+    except ImportError:
+        dependencies['pyxlsb'] = {
+            'available': False,
+            'version': None
+        }
+    
+    # Optional: Rust workbook reader used as the pandas engine with -fast (pandas >= 2.2)
+    # Read the package metadata rather than importing the extension module
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        dependencies['python-calamine'] = {
+            'available': True,
+            'version': version('python-calamine')
+        }
+    except PackageNotFoundError:
+        dependencies['python-calamine'] = {
+            'available': False,
+            'version': None
+        }
+    
     return dependencies
 
 
 # Add convenience functions to __all__
 __all__.extend([
     'quick_extract',
+    'export_file',
     'batch_process', 
     'check_dependencies',
     'DEFAULT_EXCEL_EXTENSIONS',
@@ -6,243 +6,723 @@ Extracts all non-null rows from Excel worksheets and saves to CSV or JSON format
 import argparse
 import csv
 import glob
+import importlib
+import io
+import itertools
 import json
+import math
 import os
+import shutil
 import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from importlib.metadata import version
 from pathlib import Path
+from xml.etree import ElementTree
 
+# pandas, numpy and openpyxl are imported inside the functions that read workbooks,
+# so -help and argument errors do not pay for loading them
+
+# Extensions picked up when searching a directory for Excel files
+EXCEL_FILE_EXTENSIONS = ('.xlsx', '.xls', '.xlsm', '.xlsb')
+
+# python-calamine (pandas >= 2.2) parses workbooks in Rust and is much faster than openpyxl/xlrd,
+# but it drops whitespace-only text cells, so it is only used for -fast
 try:
-    import pandas as pd
-    import openpyxl
-except ImportError as e:
-    print("Error: Required libraries not found.")
-    print("Please install with: pip install pandas openpyxl xlrd")
-    print(f"Missing: {e}")
-    sys.exit(1)
+    from python_calamine import SheetVisibleEnum
+    # Read the installed pandas version from package metadata rather than importing pandas
+    CALAMINE_AVAILABLE = tuple(int(part) for part in version('pandas').split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+CALAMINE_EXTENSIONS = ('.xlsx', '.xlsm', '.xlsb', '.xls', '.ods')
+
+# orjson encodes JSON in Rust, several times faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# xlsx2csv converts sheet XML straight to CSV text; used for plain CSV exports when installed
+try:
+    from xlsx2csv import Xlsx2csv
+    XLSX2CSV_AVAILABLE = True
+except ImportError:
+    XLSX2CSV_AVAILABLE = False
+
+# zstandard compresses CSV output on the fly for -compress (.csv.zst files)
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+# pandas engine per extension unless -fast picks calamine; .xlsb needs pyxlsb
+EXCEL_ENGINES = {
+    '.xlsx': 'openpyxl',
+    '.xlsm': 'openpyxl',
+    '.xls': 'xlrd',
+    '.xlsb': 'pyxlsb',
+    '.ods': 'odf',
+}
+
+# Large write buffers and batched writerows keep CSV export from issuing a write() per row
+CSV_BUFFER_SIZE = 1 << 20
+CSV_BATCH_ROWS = 8192
+
+
+def load_excel_libraries():
+    """Import the libraries needed to read workbooks, exiting with install instructions if missing."""
+    try:
+        # Import by name: the modules are only loaded here, the callers import them locally
+        for module_name in ('numpy', 'pandas', 'openpyxl'):
+            importlib.import_module(module_name)
+    except ImportError as e:
+        print("Error: Required libraries not found.")
+        print("Please install with: pip install pandas openpyxl xlrd")
+        print(f"Missing: {e}")
+        sys.exit(1)
+
+
+def excel_file_entries(input_dir=".", extensions=EXCEL_FILE_EXTENSIONS):
+    """Yield a DirEntry for each Excel file in input_dir, reading the directory once.
+    
+    Extensions match case-insensitively and dotfiles are skipped.
+    """
+    with os.scandir(input_dir) as entries:
+        for entry in entries:
+            if (not entry.name.startswith('.') and entry.name.lower().endswith(extensions)
+                    and entry.is_file()):
+                yield entry
 
 
 def find_newest_excel_file(input_dir="."):
     """Find the newest Excel file in the specified directory."""
-    excel_patterns = ['*.xlsx', '*.xls', '*.xlsm', '*.xlsb']
-    excel_files = []
-    
-    # Change to the specified directory for globbing
-    search_path = Path(input_dir)
-    
-    for pattern in excel_patterns:
-        excel_files.extend(search_path.glob(pattern))
+    # A single scandir pass keeping the newest entry so far; DirEntry caches stat
+    # results so each file is stat'ed once and no candidate list is built
+    newest = None
+    try:
+        for entry in excel_file_entries(input_dir):
+            # Ties on modification time go to the last name
+            candidate = (entry.stat().st_mtime_ns, entry.name)
+            if newest is None or candidate > newest:
+                newest = candidate
+    except (FileNotFoundError, NotADirectoryError):
+        pass
     
-    if not excel_files:
+    if newest is None:
         raise FileNotFoundError(f"No Excel files found in directory: {input_dir}")
     
-    # Get the newest file based on modification time
-    newest_file = max(excel_files, key=lambda f: f.stat().st_mtime)
-    return str(newest_file)
+    return str(Path(input_dir) / newest[1])
 
 
 def has_non_null_data(row):
     """Check if a row contains any non-null data."""
-    return any(cell is not None and str(cell).strip() != '' for cell in row)
+    # A plain loop is faster here than any() over a generator or map() with a
+    # lambda, both of which pay a Python call per cell
+    for cell in row:
+        if cell is None:
+            continue
+        if isinstance(cell, str):
+            # isspace() avoids allocating a stripped copy of every string
+            if cell and not cell.isspace():
+                return True
+        else:
+            try:
+                if cell == cell:  # NaN and NaT are the only values not equal to themselves
+                    return True
+            except TypeError:
+                continue  # pd.NA refuses truth testing; like NaN it is missing data
+    return False
 
 
-def extract_excel_data(filename, include_hidden=True, include_row_numbers=False, include_formulas=False):
-    """Extract data from all worksheets in an Excel file."""
+def non_empty_row_mask(df):
+    """Vectorised has_non_null_data: flag DataFrame rows holding any non-null, non-blank cell."""
+    import numpy as np
+    import pandas as pd
+    
+    filled = df.notna().to_numpy()
+    
+    # Only text columns can contain blank strings; numeric columns just need notna()
+    text_columns = df.columns.isin(df.select_dtypes(include=['object', 'string']).columns)
+    row_has_data = filled[:, ~text_columns].any(axis=1)
+    
+    # Check text cells only in rows that no earlier column has already shown to hold data
+    for position in np.flatnonzero(text_columns):
+        pending = filled[:, position] & ~row_has_data
+        if not pending.any():
+            continue
+        values = df.iloc[pending, position]
+        row_has_data[pending] = (values.astype(str).str.strip() != '').to_numpy()
+    
+    return pd.Series(row_has_data, index=df.index)
+
+
+def hidden_sheet_names(filename):
+    """Return the names of hidden sheets in an .xlsx/.xlsm file.
+    
+    Only the small xl/workbook.xml part is parsed; loading the workbook with openpyxl
+    would also read shared strings and styles just to get one attribute per sheet.
+    """
+    with zipfile.ZipFile(filename) as archive:
+        if 'xl/workbook.xml' in archive.namelist():
+            root = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+            # Match on the local tag name so transitional and strict namespaces both work
+            return {sheet.get('name') for sheet in root.iter()
+                    if sheet.tag.rsplit('}', 1)[-1] == 'sheet' and sheet.get('state') == 'hidden'}
+    
+    # Non-standard package layout: let openpyxl resolve the workbook part
+    import openpyxl
+    wb = openpyxl.load_workbook(filename, read_only=True, keep_links=False)
+    try:
+        return {name for name in wb.sheetnames if wb[name].sheet_state == 'hidden'}
+    finally:
+        wb.close()
+
+
+def worksheet_formula_rows(sheet, sheet_name, include_row_numbers=False, nrows=None, skiprows=0):
+    """Yield non-null rows from a read-only openpyxl worksheet, keeping formulas as text."""
+    # openpyxl treats max_row=0 as "no limit", so an empty window must stop here
+    if nrows == 0:
+        return
+    
+    # Bounding the row range lets openpyxl stop parsing the sheet early
+    min_row = skiprows + 1
+    max_row = skiprows + nrows if nrows is not None else None
+    
+    # values_only avoids building a Cell object per cell; with data_only=False
+    # formula cells come back as their formula text (e.g. "=SUM(A1:A3)")
+    for row_idx, row in enumerate(sheet.iter_rows(min_row=min_row, max_row=max_row, values_only=True), min_row):
+        # Check the raw values first so empty rows are skipped without building anything
+        if not has_non_null_data(row):
+            continue
+        
+        # Most rows hold no formula, so only rewrite values once one is found
+        for value in row:
+            if isinstance(value, str) and value.startswith('='):
+                # Prefix formulas with "FORMULA: " to prevent CSV interpretation and circular references
+                row = [
+                    f"FORMULA: {value}" if isinstance(value, str) and value.startswith('=') else value
+                    for value in row
+                ]
+                break
+        
+        # Build the output row
+        if include_row_numbers:
+            yield [sheet_name, row_idx, *row]
+        else:
+            yield [sheet_name, *row]
+
+
+def dataframe_rows(df, sheet_name, include_row_numbers=False, skiprows=0):
+    """Yield non-null rows from a sheet DataFrame read with header=None.
+    
+    skiprows is the number of leading sheet rows skipped when reading df, so
+    row numbers still match the worksheet.
+    """
+    import numpy as np
+    
+    # Drop empty rows in one vectorised pass, then process the survivors
+    df = df[non_empty_row_mask(df)]
+    
+    # Write the worksheet name (and row number) columns next to the values in one
+    # object array, so tolist() builds each output row directly with no per-row
+    # list concatenation or Series construction. Working a batch of rows at a time
+    # keeps only one batch of boxed cell values and row lists alive at once.
+    prefix_cols = 2 if include_row_numbers else 1
+    for start in range(0, df.shape[0], CSV_BATCH_ROWS):
+        batch = df.iloc[start:start + CSV_BATCH_ROWS]
+        rows = np.empty((batch.shape[0], batch.shape[1] + prefix_cols), dtype=object)
+        rows[:, 0] = sheet_name
+        if include_row_numbers:
+            # Excel rows are 1-indexed, and we add 1 to account for pandas 0-indexing
+            rows[:, 1] = batch.index.to_numpy() + skiprows + 1
+        # Empty cells become None (written as "" to CSV) rather than NaN (written as "nan")
+        rows[:, prefix_cols:] = batch.to_numpy(dtype=object, na_value=None)
+        yield from rows.tolist()
+
+
+def excel_engine_for(filename, fast=False):
+    """Return the pandas engine to use for filename (None lets pandas choose).
+    
+    calamine is only chosen with fast=True: it reads whitespace-only cells as empty,
+    where openpyxl and xlrd keep the text.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if fast and CALAMINE_AVAILABLE and extension in CALAMINE_EXTENSIONS:
+        return 'calamine'
+    return EXCEL_ENGINES.get(extension)
+
+
+def extract_sheets(filename, sheet_names, include_row_numbers=False, include_formulas=False,
+                   nrows=None, skiprows=0, fast=False):
+    """Extract the non-null rows of several sheets using one open handle on the workbook.
+    
+    Returns a {sheet_name: rows} dict; a sheet that could not be read maps to the
+    exception instead. Opens its own handle so it can run in a worker process.
+    """
+    import openpyxl
+    import pandas as pd
+    
+    results = {}
+    if include_formulas:
+        wb = openpyxl.load_workbook(filename, read_only=True, data_only=False, keep_links=False)
+        try:
+            for sheet_name in sheet_names:
+                try:
+                    results[sheet_name] = list(worksheet_formula_rows(wb[sheet_name], sheet_name,
+                                                                      include_row_numbers, nrows, skiprows))
+                except Exception as e:
+                    results[sheet_name] = e
+        finally:
+            wb.close()
+        return results
+    
+    excel_file = pd.ExcelFile(filename, engine=excel_engine_for(filename, fast))
+    try:
+        for sheet_name in sheet_names:
+            try:
+                df = excel_file.parse(sheet_name, header=None, nrows=nrows, skiprows=skiprows or None)
+                results[sheet_name] = [] if df.empty else list(dataframe_rows(df, sheet_name,
+                                                                              include_row_numbers, skiprows))
+            except Exception as e:
+                results[sheet_name] = e
+    finally:
+        excel_file.close()
+    return results
+
+
+def iter_excel_data(filename, include_hidden=True, include_row_numbers=False, include_formulas=False,
+                    max_workers=None, nrows=None, skiprows=0, fast=False):
+    """Yield non-null rows from all worksheets in an Excel file, one at a time.
+    
+    With max_workers > 1, sheets are extracted in parallel worker processes and
+    yielded in workbook order. skiprows skips that many leading rows of every
+    sheet and nrows stops reading each sheet after that many rows, so the
+    readers never parse the rest of a large sheet. fast=True reads values with
+    calamine when it is installed (see excel_engine_for).
+    """
+    import openpyxl
+    import pandas as pd
+    
     try:
-        extracted_data = []
+        # Formulas and sheet visibility both need openpyxl, which only reads .xlsx/.xlsm
+        is_xlsx_family = os.path.splitext(filename)[1].lower() in ('.xlsx', '.xlsm')
         
         # Check for unsupported file types with formulas option
-        if include_formulas and not filename.lower().endswith(('.xlsx', '.xlsm')):
+        if include_formulas and not is_xlsx_family:
             print(f"Warning: -formulas option only works with .xlsx and .xlsm files.")
             print(f"File '{filename}' will be processed with calculated values instead of formulas.")
             include_formulas = False  # Disable formulas for unsupported files
         
         # If formulas are requested, we need to use openpyxl for direct cell access
-        if include_formulas and filename.lower().endswith(('.xlsx', '.xlsm')):
-            wb = openpyxl.load_workbook(filename, data_only=False)
+        if include_formulas:
+            # read_only streams each sheet instead of building the full workbook in memory
+            wb = openpyxl.load_workbook(filename, read_only=True, data_only=False, keep_links=False)
             
-            for sheet_name in wb.sheetnames:
-                try:
-                    sheet = wb[sheet_name]
-                    
+            try:
+                sheet_names = []
+                for sheet_name in wb.sheetnames:
                     # Check if sheet is hidden
-                    if not include_hidden and sheet.sheet_state == 'hidden':
+                    if not include_hidden and wb[sheet_name].sheet_state == 'hidden':
                         print(f"Skipping hidden sheet: {sheet_name}")
                         continue
-                    
-                    # Process each row in the sheet
-                    for row_idx, row in enumerate(sheet.iter_rows(values_only=False), 1):
-                        row_data = []
-                        has_data = False
-                        
-                        for cell in row:
-                            if cell.value is not None:
-                                # Check if cell has a formula
-                                if hasattr(cell, 'formula') and cell.formula:
-                                    # Prefix with "FORMULA: " to prevent CSV interpretation and circular references
-                                    row_data.append(f"FORMULA: ={cell.formula}")
-                                else:
-                                    row_data.append(cell.value)
-                                has_data = True
-                            else:
-                                row_data.append(None)
-                        
-                        if has_data and has_non_null_data(row_data):
-                            # Build the output row
-                            if include_row_numbers:
-                                row_with_metadata = [sheet_name, row_idx] + row_data
-                            else:
-                                row_with_metadata = [sheet_name] + row_data
-                            
-                            extracted_data.append(row_with_metadata)
-                            
-                except Exception as e:
-                    print(f"Warning: Could not process sheet '{sheet_name}': {e}")
-                    continue
+                    sheet_names.append(sheet_name)
+                
+                # A single sheet gains nothing from a worker process
+                if max_workers and max_workers > 1 and len(sheet_names) > 1:
+                    yield from parallel_sheet_rows(filename, sheet_names, include_row_numbers,
+                                                   include_formulas, max_workers, nrows, skiprows, fast)
+                    return
+                
+                for sheet_name in sheet_names:
+                    try:
+                        yield from worksheet_formula_rows(wb[sheet_name], sheet_name, include_row_numbers,
+                                                          nrows, skiprows)
+                    except Exception as e:
+                        print(f"Warning: Could not process sheet '{sheet_name}': {e}")
+                        continue
+            finally:
+                # Read-only workbooks keep the zip archive open until closed
+                wb.close()
         
         else:
-            # Use pandas for standard data extraction (calculated values)
-            excel_file = pd.ExcelFile(filename)
+            # Use pandas for standard data extraction (calculated values).
+            # The ExcelFile is parsed once and reused for every sheet.
+            engine = excel_engine_for(filename, fast)
+            excel_file = pd.ExcelFile(filename, engine=engine)
             
-            for sheet_name in excel_file.sheet_names:
-                try:
-                    # Read the sheet into a DataFrame
-                    df = pd.read_excel(filename, sheet_name=sheet_name, header=None)
-                    
-                    # Skip empty sheets
-                    if df.empty:
+            # Check sheet visibility once up front. calamine reports it for every format
+            # from the workbook already open; otherwise only .xlsx/.xlsm are checked, by
+            # reading the sheet list from the archive, and .xls/.xlsb are not reopened
+            hidden_sheets = set()
+            if not include_hidden and engine == 'calamine':
+                hidden_sheets = {sheet.name for sheet in excel_file.book.sheets_metadata
+                                 if sheet.visible == SheetVisibleEnum.Hidden}
+            elif not include_hidden and is_xlsx_family:
+                # A workbook pandas could open but whose sheet list cannot be read is corrupt;
+                # let the error reach the outer handler instead of exporting hidden sheets
+                hidden_sheets = hidden_sheet_names(filename)
+            
+            try:
+                sheet_names = []
+                for sheet_name in excel_file.sheet_names:
+                    if sheet_name in hidden_sheets:
+                        print(f"Skipping hidden sheet: {sheet_name}")
                         continue
-                    
-                    # Check if sheet is hidden (requires openpyxl for .xlsx files)
-                    if not include_hidden:
-                        try:
-                            # Load workbook to check sheet visibility
-                            if filename.lower().endswith(('.xlsx', '.xlsm')):
-                                wb = openpyxl.load_workbook(filename)
-                                if sheet_name in wb.sheetnames:
-                                    sheet = wb[sheet_name]
-                                    if sheet.sheet_state == 'hidden':
-                                        print(f"Skipping hidden sheet: {sheet_name}")
-                                        continue
-                        except Exception:
-                            # If we can't check visibility, include the sheet
-                            pass
-                    
-                    # Convert DataFrame to list of lists and process each row
-                    for row_idx, row in df.iterrows():
-                        row_data = row.tolist()
-                        if has_non_null_data(row_data):
-                            # Build the output row
-                            if include_row_numbers:
-                                # Excel rows are 1-indexed, and we add 1 to account for pandas 0-indexing
-                                excel_row_number = row_idx + 1
-                                row_with_metadata = [sheet_name, excel_row_number] + row_data
-                            else:
-                                row_with_metadata = [sheet_name] + row_data
-                            
-                            extracted_data.append(row_with_metadata)
-                            
-                except Exception as e:
-                    print(f"Warning: Could not process sheet '{sheet_name}': {e}")
-                    continue
+                    sheet_names.append(sheet_name)
+                
+                # A single sheet gains nothing from a worker process
+                if max_workers and max_workers > 1 and len(sheet_names) > 1:
+                    yield from parallel_sheet_rows(filename, sheet_names, include_row_numbers,
+                                                   include_formulas, max_workers, nrows, skiprows, fast)
+                    return
+                
+                for sheet_name in sheet_names:
+                    try:
+                        # Read the sheet into a DataFrame
+                        df = excel_file.parse(sheet_name, header=None, nrows=nrows, skiprows=skiprows or None)
+                        
+                        # Skip empty sheets
+                        if df.empty:
+                            continue
+                        
+                        yield from dataframe_rows(df, sheet_name, include_row_numbers, skiprows)
+                                
+                    except Exception as e:
+                        print(f"Warning: Could not process sheet '{sheet_name}': {e}")
+                        continue
+            finally:
+                excel_file.close()
         
-        return extracted_data
+    except Exception as e:
+        raise Exception(f"Error reading Excel file '{filename}': {str(e)}")
+
+
+def iter_xlsx2csv_rows(filename, include_hidden=True):
+    """Yield non-null rows from all worksheets of an .xlsx/.xlsm file using xlsx2csv.
+    
+    xlsx2csv never builds cell objects, so this is much faster than the pandas or
+    openpyxl readers, but every value comes back as the text xlsx2csv formats.
+    """
+    try:
+        with Xlsx2csv(filename, outputencoding='utf-8', skip_hidden_rows=False) as converter:
+            for sheet in converter.workbook.sheets:
+                if not include_hidden and sheet.get('state') == 'hidden':
+                    print(f"Skipping hidden sheet: {sheet['name']}")
+                    continue
+                
+                with tempfile.TemporaryFile('w+', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as body:
+                    converter.convert(body, sheetid=sheet['index'])
+                    body.seek(0)
+                    for row in csv.reader(body):
+                        if has_non_null_data(row):
+                            yield [sheet['name'], *row]
         
     except Exception as e:
         raise Exception(f"Error reading Excel file '{filename}': {str(e)}")
 
 
-def write_to_csv(data, output_filename, include_row_numbers=False):
-    """Write extracted data to CSV file."""
+def iter_csv_rows(filename, include_hidden=True, include_row_numbers=False, include_formulas=False,
+                  max_workers=None, nrows=None, skiprows=0, fast=False):
+    """Yield rows for a CSV export, taking the xlsx2csv fast path only when asked to.
+    
+    xlsx2csv formats values differently from pandas (TRUE/FALSE, 7 for 7.0, dates
+    without times, 'NA' kept as text), so it is opt-in via fast=True. It is used for
+    .xlsx/.xlsm files when installed and no option needs cell metadata (row numbers,
+    formulas or a row window); otherwise this is iter_excel_data, passed fast along.
+    """
+    if (fast and XLSX2CSV_AVAILABLE and not include_row_numbers and not include_formulas
+            and nrows is None and not skiprows and filename.lower().endswith(('.xlsx', '.xlsm'))):
+        return iter_xlsx2csv_rows(filename, include_hidden)
+    return iter_excel_data(filename, include_hidden, include_row_numbers, include_formulas,
+                           max_workers=max_workers, nrows=nrows, skiprows=skiprows, fast=fast)
+
+
+def parallel_sheet_rows(filename, sheet_names, include_row_numbers, include_formulas, max_workers,
+                        nrows=None, skiprows=0, fast=False):
+    """Extract sheets in worker processes and yield their rows in sheet order.
+    
+    Sheets are dealt round-robin into one batch per worker, so each worker opens
+    and parses the workbook once rather than once per sheet.
+    """
+    # More workers than CPU cores or sheets would only add process start-up cost
+    workers = min(max_workers, os.cpu_count() or 1, len(sheet_names))
+    if workers == 0:
+        return
+    batches = [sheet_names[i::workers] for i in range(workers)]
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(extract_sheets, filename, batch, include_row_numbers, include_formulas,
+                            nrows, skiprows, fast)
+            for batch in batches
+        ]
+        for batch, future in zip(batches, futures):
+            try:
+                results.update(future.result())
+            except Exception as e:
+                results.update((sheet_name, e) for sheet_name in batch)
+    
+    for sheet_name in sheet_names:
+        rows = results[sheet_name]
+        if isinstance(rows, Exception):
+            print(f"Warning: Could not process sheet '{sheet_name}': {rows}")
+            continue
+        yield from rows
+
+
+def extract_excel_data(filename, include_hidden=True, include_row_numbers=False, include_formulas=False,
+                       max_workers=None, nrows=None, skiprows=0, fast=False):
+    """Extract data from all worksheets in an Excel file."""
+    return list(iter_excel_data(filename, include_hidden, include_row_numbers, include_formulas,
+                                max_workers=max_workers, nrows=nrows, skiprows=skiprows, fast=fast))
+
+
+def build_column_names(max_cols, include_row_numbers=False):
+    """Build output column names for rows that are max_cols wide (metadata columns included)."""
+    if include_row_numbers:
+        # Structure: [worksheet_name, row_number, ...data_columns...]
+        metadata_columns = ['Worksheet', 'Row_Number']
+    else:
+        # Structure: [worksheet_name, ...data_columns...]
+        metadata_columns = ['Worksheet']
+    
+    data_cols = max_cols - len(metadata_columns)
+    return metadata_columns + [f'Column_{i}' for i in range(1, data_cols + 1)]
+
+
+def open_output(output_filename, compress=False):
+    """Open output_filename for writing bytes, as a zstd stream when compress is set."""
+    if not compress:
+        return open(output_filename, 'wb', buffering=CSV_BUFFER_SIZE)
+    
+    if not ZSTANDARD_AVAILABLE:
+        raise ImportError("zstandard is required for compressed output (pip install zstandard)")
+    
+    # threads=-1 compresses on all cores while rows are still being written
+    compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+    return compressor.stream_writer(open(output_filename, 'wb', buffering=CSV_BUFFER_SIZE))
+
+
+def open_csv_output(output_filename, compress=False):
+    """Open output_filename for CSV text, zstd-compressed when compress is set."""
+    if not compress:
+        return open(output_filename, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+    return io.TextIOWrapper(open_output(output_filename, compress), encoding='utf-8', newline='')
+
+
+def write_to_csv(data, output_filename, include_row_numbers=False, max_cols=None, compress=False):
+    """Write extracted data to CSV file.
+    
+    data may be a list of rows or any iterable of rows (e.g. from iter_excel_data).
+    Iterables are streamed through a temporary file so the header width is known
+    without holding every row in memory. When the caller already knows the widest
+    row, passing max_cols writes the header first and streams rows straight to the
+    output with no width pass or spool. With compress, the file is written as a
+    zstd stream (see open_csv_output). Returns the number of rows written.
+    """
     try:
-        with open(output_filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write header
-            if data:
-                # Determine maximum number of columns in the data
-                max_cols = max(len(row) for row in data) if data else 0
+        body = None
+        if max_cols is not None:
+            # Header width supplied by the caller; rows are written as they arrive
+            row_count = None
+        elif isinstance(data, list):
+            # Determine maximum number of columns in the data
+            max_cols = max((len(row) for row in data), default=0)
+            row_count = len(data)
+        else:
+            # Spool rows to disk while tracking the widest row for the header
+            body = tempfile.TemporaryFile('w+', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE)
+            body_writer = csv.writer(body)
+            max_cols = 0
+            row_count = 0
+            rows = iter(data)
+            for batch in iter(lambda: list(itertools.islice(rows, CSV_BATCH_ROWS)), []):
+                body_writer.writerows(batch)
+                max_cols = max(max_cols, max(map(len, batch)))
+                row_count += len(batch)
+            body.seek(0)
+        
+        try:
+            with open_csv_output(output_filename, compress) as csvfile:
+                writer = csv.writer(csvfile)
                 
-                if include_row_numbers:
-                    # Structure: [worksheet_name, row_number, ...data_columns...]
-                    # So data columns = total columns - 2
-                    data_cols = max_cols - 2
-                    if data_cols > 0:
-                        header = ['Worksheet', 'Row_Number'] + [f'Column_{i}' for i in range(1, data_cols + 1)]
-                    else:
-                        header = ['Worksheet', 'Row_Number']
+                if row_count is None:
+                    # Write header, then stream the rows in batches
+                    writer.writerow(build_column_names(max_cols, include_row_numbers))
+                    row_count = 0
+                    rows = iter(data)
+                    for batch in iter(lambda: list(itertools.islice(rows, CSV_BATCH_ROWS)), []):
+                        writer.writerows(batch)
+                        row_count += len(batch)
                 else:
-                    # Structure: [worksheet_name, ...data_columns...]
-                    # So data columns = total columns - 1
-                    data_cols = max_cols - 1
-                    if data_cols > 0:
-                        header = ['Worksheet'] + [f'Column_{i}' for i in range(1, data_cols + 1)]
+                    # Write header
+                    if row_count:
+                        writer.writerow(build_column_names(max_cols, include_row_numbers))
+                    
+                    # Write data rows
+                    if body is None:
+                        writer.writerows(data)
                     else:
-                        header = ['Worksheet']
-                
-                writer.writerow(header)
-            
-            # Write data rows
-            for row in data:
-                writer.writerow(row)
+                        # Both files hold the same UTF-8 text, so copy the spool as raw
+                        # bytes rather than decoding and re-encoding every chunk
+                        csvfile.flush()
+                        shutil.copyfileobj(body.buffer, csvfile.buffer, CSV_BUFFER_SIZE)
+        finally:
+            if body is not None:
+                body.close()
                 
         print(f"Data successfully exported to: {output_filename}")
-        print(f"Total rows exported: {len(data)}")
+        print(f"Total rows exported: {row_count}")
+        return row_count
         
     except Exception as e:
         raise Exception(f"Error writing to CSV file '{output_filename}': {str(e)}")
 
 
-def write_to_json(data, output_filename, include_row_numbers=False):
-    """Write extracted data to JSON file, excluding null values."""
+def dump_excel_to_csv(filename, output_filename, include_hidden=True, include_row_numbers=False,
+                      include_formulas=False, max_workers=None, nrows=None, skiprows=0, compress=False,
+                      fast=False):
+    """Extract an Excel file straight into a CSV file in a single streaming pass.
+    
+    Rows go from the workbook reader to the CSV writer without an intermediate list.
+    fast=True opts into the xlsx2csv and calamine readers (see iter_csv_rows).
+    Returns the number of rows written; no file is created when there is no data.
+    """
+    rows = iter(iter_csv_rows(filename, include_hidden, include_row_numbers, include_formulas,
+                              max_workers=max_workers, nrows=nrows, skiprows=skiprows, fast=fast))
+    first_row = next(rows, None)
+    if first_row is None:
+        return 0
+    
+    return write_to_csv(itertools.chain([first_row], rows), output_filename, include_row_numbers,
+                        compress=compress)
+
+
+def is_json_value(value):
+    """Check if a cell value should be kept in JSON output (not null, blank or NaN)."""
+    # Fast paths for the types Excel readers produce, avoiding str() per cell
+    if value is None:
+        return False
+    value_type = type(value)
+    if value_type is str:
+        return value.lower() != 'nan' and not (value == '' or value.isspace())
+    if value_type is int or value_type is bool:
+        return True
+    if value_type is float:
+        return value == value  # NaN is the only value not equal to itself
+    
+    # Skip pandas NA values and anything that prints as blank or 'nan'
+    return (not (hasattr(value, 'isna') and value.isna()) and
+            str(value).lower() != 'nan' and
+            str(value).strip() != '')
+
+
+def orjson_formats_like_json(record):
+    """Check that orjson would write every float in record exactly as the stdlib encoder does.
+    
+    orjson writes 1e16/1e-7 where json writes 1e+16/1e-07, and null for inf/nan where
+    json writes Infinity/NaN; all other floats come out the same.
+    """
+    for value in record.values():
+        if type(value) is float and (not math.isfinite(value) or 'e' in repr(value)):
+            return False
+    return True
+
+
+def encode_json_record(record):
+    """Encode one output object as UTF-8 JSON with 2-space indentation."""
+    if ORJSON_AVAILABLE and orjson_formats_like_json(record):
+        try:
+            # Dates go through default=str, as with the stdlib encoder, instead of orjson's RFC 3339
+            return orjson.dumps(record, default=str,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME)
+        except orjson.JSONEncodeError:
+            # orjson rejects a few values json accepts (lone surrogates, ints over 64 bits)
+            pass
+    return json.dumps(record, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def write_to_json(data, output_filename, include_row_numbers=False, compress=False):
+    """Write extracted data to JSON file, excluding null values.
+    
+    data may be a list of rows or any iterable of rows (e.g. from iter_excel_data).
+    Rows are encoded one object at a time, so no intermediate list of dicts is built;
+    iterables are spooled to a temporary file so a failed read leaves no partial output.
+    The result matches a single indent=2 dump of the whole array. With compress, the
+    file is written as a zstd stream. Returns the number of rows written.
+    """
     try:
-        json_data = []
+        body = None
+        if not isinstance(data, list):
+            body = tempfile.TemporaryFile(buffering=CSV_BUFFER_SIZE)
         
-        if data:
-            # Determine maximum number of columns in the data
-            max_cols = max(len(row) for row in data) if data else 0
-            
-            # Create column names based on structure
-            if include_row_numbers:
-                # Structure: [worksheet_name, row_number, ...data_columns...]
-                data_cols = max_cols - 2
-                if data_cols > 0:
-                    column_names = ['Worksheet', 'Row_Number'] + [f'Column_{i}' for i in range(1, data_cols + 1)]
-                else:
-                    column_names = ['Worksheet', 'Row_Number']
-            else:
-                # Structure: [worksheet_name, ...data_columns...]
-                data_cols = max_cols - 1
-                if data_cols > 0:
-                    column_names = ['Worksheet'] + [f'Column_{i}' for i in range(1, data_cols + 1)]
-                else:
-                    column_names = ['Worksheet']
-            
-            # Convert each row to a dictionary, excluding null values
-            for row in data:
-                row_dict = {}
-                for i, value in enumerate(row[:len(column_names)]):
-                    # Skip null values, empty strings, and pandas NA values
-                    if (value is not None and 
-                        not (hasattr(value, 'isna') and value.isna()) and 
-                        str(value).lower() != 'nan' and 
-                        str(value).strip() != ''):
-                        row_dict[column_names[i]] = value
-                json_data.append(row_dict)
-        
-        # Write JSON with pretty formatting
-        with open(output_filename, 'w', encoding='utf-8') as jsonfile:
-            json.dump(json_data, jsonfile, indent=2, ensure_ascii=False, default=str)
+        try:
+            with (body or open_output(output_filename, compress)) as jsonfile:
+                # Column names only depend on position, so they grow with the widest row seen
+                column_names = []
+                row_count = 0
+                for row in data:
+                    if len(row) > len(column_names):
+                        column_names = build_column_names(len(row), include_row_numbers)
+                    
+                    # Convert the row to a dictionary, excluding null values
+                    record = {name: value for name, value in zip(column_names, row) if is_json_value(value)}
+                    encoded = encode_json_record(record)
+                    
+                    # Nest the object one level into the array, as a pretty-printed dump would
+                    jsonfile.write(b',\n  ' if row_count else b'[\n  ')
+                    jsonfile.write(encoded.replace(b'\n', b'\n  '))
+                    row_count += 1
+                jsonfile.write(b'\n]' if row_count else b'[]')
+                
+                if body is not None:
+                    body.seek(0)
+                    with open_output(output_filename, compress) as outfile:
+                        shutil.copyfileobj(body, outfile, CSV_BUFFER_SIZE)
+        finally:
+            if body is not None:
+                body.close()
                 
         print(f"Data successfully exported to: {output_filename}")
-        print(f"Total rows exported: {len(data)}")
+        print(f"Total rows exported: {row_count}")
+        return row_count
         
     except Exception as e:
         raise Exception(f"Error writing to JSON file '{output_filename}': {str(e)}")
 
 
-def generate_output_filename(input_filename, output_dir=None, output_format='csv'):
-    """Generate output filename based on input filename with timestamp."""
+def dump_excel_to_json(filename, output_filename, include_hidden=True, include_row_numbers=False,
+                       include_formulas=False, max_workers=None, nrows=None, skiprows=0, compress=False,
+                       fast=False):
+    """Extract an Excel file straight into a JSON file in a single streaming pass.
+    
+    fast=True opts into the calamine reader (see iter_excel_data).
+    Returns the number of rows written; no file is created when there is no data.
+    """
+    rows = iter(iter_excel_data(filename, include_hidden, include_row_numbers, include_formulas,
+                                max_workers=max_workers, nrows=nrows, skiprows=skiprows, fast=fast))
+    first_row = next(rows, None)
+    if first_row is None:
+        return 0
+    
+    return write_to_json(itertools.chain([first_row], rows), output_filename, include_row_numbers,
+                         compress=compress)
+
+
+def generate_output_filename(input_filename, output_dir=None, output_format='csv', reserved=(),
+                             compress=False):
+    """Generate output filename based on input filename with timestamp.
+    
+    Paths in reserved are treated as taken even though they do not exist yet, so
+    names can be handed out up front for files that are written later. compress
+    adds the .zst suffix used for zstd-compressed output.
+    """
     input_path = Path(input_filename)
     base_name = input_path.stem
     
@@ -250,9 +730,11 @@ def generate_output_filename(input_filename, output_dir=None, output_format='csv
     mod_time = os.path.getmtime(input_filename)
     mod_datetime = datetime.fromtimestamp(mod_time).astimezone()
     
-    # Format timestamp as ISO 8601 (e.g., 2025-07-21T14:30:52-05:00)
-    # Replace colons with hyphens for filename compatibility
-    timestamp = mod_datetime.isoformat().replace(':', '-')
+    # Format timestamp as ISO 8601 with hyphens instead of colons for filename
+    # compatibility (e.g., 2025-07-21T14-30-52-05-00), built directly by strftime
+    time_format = '%Y-%m-%dT%H-%M-%S.%f%z' if mod_datetime.microsecond else '%Y-%m-%dT%H-%M-%S%z'
+    timestamp = mod_datetime.strftime(time_format)
+    timestamp = f"{timestamp[:-2]}-{timestamp[-2:]}"
     
     base_filename = f"dumperpy_{base_name}_{timestamp}"
     
@@ -267,17 +749,29 @@ def generate_output_filename(input_filename, output_dir=None, output_format='csv
     
     # Set file extension based on format
     file_extension = '.json' if output_format == 'json' else '.csv'
+    if compress:
+        file_extension += '.zst'
+    
+    # List the target directory once and probe for a free name in memory
+    # instead of issuing an exists() stat call per candidate
+    target_dir = base_path.parent
+    prefix = base_path.name
+    try:
+        with os.scandir(target_dir) as entries:
+            taken = {entry.name for entry in entries if entry.name.startswith(prefix)}
+    except FileNotFoundError:
+        taken = set()
     
-    # Check if file exists and find an available filename
     counter = 0
     while True:
         if counter == 0:
-            final_filename = f"{base_path}{file_extension}"
+            candidate = f"{prefix}{file_extension}"
         else:
-            final_filename = f"{base_path}({counter}){file_extension}"
+            candidate = f"{prefix}({counter}){file_extension}"
         
-        if not Path(final_filename).exists():
-            return str(final_filename)
+        output_filename = str(target_dir / candidate)
+        if candidate not in taken and output_filename not in reserved:
+            return output_filename
         
         counter += 1
 
@@ -298,6 +792,14 @@ OPTIONS:
     -rownumbers        Include Excel row numbers in output (default: exclude row numbers)
     -formulas          Show formulas instead of calculated values (.xlsx/.xlsm only)
     -json              Output to JSON format instead of CSV (default: CSV)
+    -workers N         Extract worksheets in N parallel processes (default: 1, serial)
+    -nrows N           Read at most N rows from each worksheet (default: all rows)
+    -skiprows N        Skip the first N rows of each worksheet (default: 0)
+    -compress          Write zstd-compressed output (.csv.zst or .json.zst; needs zstandard)
+    -fast              Use the faster readers: xlsx2csv for plain CSV exports and python-calamine
+                       otherwise (needs either package; xlsx2csv writes values as it formats
+                       them, e.g. TRUE/FALSE and 7 for 7.0, and calamine reads whitespace-only
+                       cells as empty)
     -help              Show this help message
 
 EXAMPLES:
@@ -309,6 +811,10 @@ EXAMPLES:
     python dumper.py -formulas          # Show formulas instead of values in CSV
     python dumper.py -input ./source    # Process newest file from ./source directory
     python dumper.py -input ./source -output ./exports  # Source and output directories
+    python dumper.py -file big.xlsx -workers 4  # Extract sheets of a large workbook in parallel
+    python dumper.py -file big.xlsx -nrows 100  # Preview the first 100 rows of each worksheet
+    python dumper.py -file big.xlsx -compress   # Write a zstd-compressed CSV file
+    python dumper.py -file big.xlsx -fast       # Faster export via xlsx2csv/python-calamine
     python dumper.py -input /data -file report.xlsx -rownumbers -json  # Specific file with row numbers to JSON
     python dumper.py -file data.xlsx -output ./exports -no-hide -rownumbers -formulas -json  # All options combined
 
@@ -340,6 +846,11 @@ PYTHON DEPENDENCIES:
     - pandas         (pip install pandas)
     - openpyxl       (pip install openpyxl) - for .xlsx/.xlsm files
     - xlrd           (pip install xlrd) - for .xls files
+    - pyxlsb         (pip install pyxlsb) - for .xlsb files
+    - python-calamine (pip install python-calamine) - optional, faster workbook reader for -fast
+    - xlsx2csv       (pip install xlsx2csv) - optional, for -fast plain CSV export of .xlsx/.xlsm files
+    - orjson         (pip install orjson) - optional, faster JSON output
+    - zstandard      (pip install zstandard) - optional, for -compress
     - Standard library: argparse, csv, json, glob, os, sys, pathlib, datetime
 
     Install all at once: pip install pandas openpyxl xlrd
@@ -349,10 +860,24 @@ SUPPORTED EXCEL FORMATS:
     - .xls  (Excel 97-2003)
     - .xlsm (Excel Macro-Enabled)
     - .xlsb (Excel Binary)
+
+    When searching a directory, extensions match in any case (REPORT.XLSX is found)
+    and files whose names start with '.' are skipped.
 """
     print(help_text)
 
 
+def non_negative_int(value):
+    """argparse type for row counts: an integer that is zero or greater."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer value: '{value}'")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be zero or greater, got {number}")
+    return number
+
+
 def main():
     """Main function to handle command line arguments and orchestrate the process."""
     
@@ -369,6 +894,11 @@ def main():
     parser.add_argument('-formulas', action='store_true', help='Show formulas instead of calculated values (.xlsx/.xlsm only)')
     parser.add_argument('-rownumbers', action='store_true', help='Include Excel row numbers in output')
     parser.add_argument('-json', action='store_true', help='Output to JSON format instead of CSV')
+    parser.add_argument('-workers', type=int, default=1, help='Number of worksheets to extract in parallel')
+    parser.add_argument('-nrows', type=non_negative_int, default=None, help='Maximum number of rows to read from each worksheet')
+    parser.add_argument('-skiprows', type=non_negative_int, default=0, help='Number of leading rows to skip in each worksheet')
+    parser.add_argument('-compress', action='store_true', help='Write zstd-compressed output (.csv.zst/.json.zst)')
+    parser.add_argument('-fast', action='store_true', help='Read workbooks with xlsx2csv/python-calamine (values can differ slightly)')
     
     try:
         args = parser.parse_args()
@@ -399,6 +929,14 @@ def main():
                 print(f"Error: {e}")
                 sys.exit(1)
         
+        if args.compress and not ZSTANDARD_AVAILABLE:
+            print("Error: -compress requires the zstandard package (pip install zstandard).")
+            sys.exit(1)
+        
+        if args.fast and not (XLSX2CSV_AVAILABLE or CALAMINE_AVAILABLE):
+            print("Error: -fast requires the xlsx2csv or python-calamine package (pip install xlsx2csv python-calamine).")
+            sys.exit(1)
+        
         # Extract data
         include_hidden = not args.no_hide
         include_row_numbers = args.rownumbers
@@ -409,19 +947,26 @@ def main():
         print(f"Including formulas: {include_formulas}")
         print(f"Output format: {output_format.upper()}")
         
-        extracted_data = extract_excel_data(input_file, include_hidden, include_row_numbers, include_formulas)
-        
-        if not extracted_data:
-            print("No data found to export.")
-            return
+        load_excel_libraries()
         
-        # Generate output filename and write file
-        output_file = generate_output_filename(input_file, args.output_dir, output_format)
+        # Generate output filename, then stream rows from the workbook straight into it;
+        # no file is written when there is no data
+        output_file = generate_output_filename(input_file, args.output_dir, output_format,
+                                               compress=args.compress)
         
+        # Only CSV exports can take the xlsx2csv fast path; JSON keeps typed values and
+        # -fast only switches it to calamine
         if output_format == 'json':
-            write_to_json(extracted_data, output_file, include_row_numbers)
+            row_count = dump_excel_to_json(input_file, output_file, include_hidden, include_row_numbers,
+                                           include_formulas, max_workers=args.workers, nrows=args.nrows,
+                                           skiprows=args.skiprows, compress=args.compress, fast=args.fast)
         else:
-            write_to_csv(extracted_data, output_file, include_row_numbers)
+            row_count = dump_excel_to_csv(input_file, output_file, include_hidden, include_row_numbers,
+                                          include_formulas, max_workers=args.workers, nrows=args.nrows,
+                                          skiprows=args.skiprows, compress=args.compress, fast=args.fast)
+        
+        if not row_count:
+            print("No data found to export.")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -5,6 +5,7 @@ Replace your conftest.py with this content.
 
 import pytest
 import os
+import shutil
 from pathlib import Path
 import tempfile
 import openpyxl
@@ -69,19 +70,35 @@ def large_xlsx_file(fixtures_dir):
     return str(file_path)
 
 
-@pytest.fixture
-def temp_excel_file():
-    """Create a temporary Excel file that gets cleaned up after test."""
-    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
-        temp_path = tmp.name
-    
-    # Create a basic Excel file
+@pytest.fixture(scope="session")
+def temp_excel_template(tmp_path_factory):
+    """Build the basic temporary Excel file once per session."""
+    template_path = tmp_path_factory.mktemp("templates") / "temp_template.xlsx"
     wb = Workbook()
     ws = wb.active
     ws.title = "TempSheet"
     ws.append(["Temp", "Data"])
     ws.append(["Test", "Value"])
-    wb.save(temp_path)
+    wb.save(template_path)
+    return str(template_path)
+
+
+@pytest.fixture(scope="session")
+def cli_dummy_xlsx(tmp_path_factory):
+    """Provide an empty placeholder .xlsx shared by CLI tests that never read it."""
+    file_path = tmp_path_factory.mktemp("cli") / "test.xlsx"
+    file_path.touch()
+    return file_path
+
+
+@pytest.fixture
+def temp_excel_file(temp_excel_template):
+    """Create a temporary Excel file that gets cleaned up after test."""
+    fd, temp_path = tempfile.mkstemp(suffix='.xlsx')
+    os.close(fd)
+    
+    # Copy the prebuilt workbook instead of saving a new one
+    shutil.copyfile(temp_excel_template, temp_path)
     
     yield temp_path
     
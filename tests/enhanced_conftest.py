@@ -1,45 +1,60 @@
 """
 Enhanced pytest configuration with additional fixtures for comprehensive Excel testing.
-This extends your existing conftest.py with more test fixtures.
+Loaded as a plugin through pytest_plugins in the root conftest.py; it relies on the
+fixtures_dir, temp_excel_template and temp_excel_file fixtures from the conftest files.
 """
 
 import pytest
 import os
+import random
+from importlib.util import find_spec
 from pathlib import Path
-import tempfile
-import openpyxl
-from openpyxl import Workbook
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 
 
-# Add these fixtures to your existing conftest.py file
+# xlsxwriter is optional; it writes the performance workbook much faster than openpyxl
+XLSXWRITER_AVAILABLE = find_spec("xlsxwriter") is not None
+
+# Header row of the performance workbook
+PERFORMANCE_HEADER = ["ID", "Name", "Category", "Value", "Timestamp"]
+
+# Bump when a fixture generator changes what it writes, so cached workbooks are rebuilt
+FIXTURE_GENERATOR_VERSION = 2
+
+
+# Sheets written by each scenario helper into the shared fixture workbook
+COMPREHENSIVE_SHEETS = ["StandardData", "WithEmptyRows", "NumericData", "MixedTypes"]
+EDGE_CASE_SHEETS = ["LongText", "SpecialChars", "NumericEdges", "EmptyContent"]
+DATA_TYPE_SHEETS = ["DataTypes"]
 
 
 @pytest.fixture(scope="session")
-def comprehensive_xlsx_file(fixtures_dir):
-    """Create a comprehensive test file with various data scenarios."""
-    file_path = fixtures_dir / "comprehensive_test.xlsx"
-    if not file_path.exists():
-        create_comprehensive_xlsx(file_path)
+def all_fixtures_workbook(fixtures_dir):
+    """Create one workbook holding every scenario sheet, reused while its generator is unchanged."""
+    file_path = fixtures_dir / "all_fixtures.xlsx"
+    cache_key = fixture_cache_key("all_fixtures")
+    if not fixture_is_current(file_path, cache_key):
+        create_all_fixtures_xlsx(file_path)
+        mark_fixture_current(file_path, cache_key)
     return str(file_path)
 
 
 @pytest.fixture(scope="session")
-def edge_cases_xlsx_file(fixtures_dir):
-    """Create Excel file with edge case scenarios."""
-    file_path = fixtures_dir / "edge_cases.xlsx"
-    if not file_path.exists():
-        create_edge_cases_xlsx(file_path)
-    return str(file_path)
+def comprehensive_xlsx_file(all_fixtures_workbook):
+    """Return (path, sheet_names) for the comprehensive data scenarios."""
+    return all_fixtures_workbook, COMPREHENSIVE_SHEETS
 
 
 @pytest.fixture(scope="session")
-def data_types_xlsx_file(fixtures_dir):
-    """Create Excel file with various data types for testing."""
-    file_path = fixtures_dir / "data_types.xlsx"
-    if not file_path.exists():
-        create_data_types_xlsx(file_path)
-    return str(file_path)
+def edge_cases_xlsx_file(all_fixtures_workbook):
+    """Return (path, sheet_names) for the edge case scenarios."""
+    return all_fixtures_workbook, EDGE_CASE_SHEETS
+
+
+@pytest.fixture(scope="session")
+def data_types_xlsx_file(all_fixtures_workbook):
+    """Return (path, sheet_names) for the data type scenarios."""
+    return all_fixtures_workbook, DATA_TYPE_SHEETS
 
 
 @pytest.fixture(scope="session")
@@ -53,38 +68,28 @@ def corrupted_file_simulation(fixtures_dir):
     return str(file_path)
 
 
-@pytest.fixture
-def temp_excel_file():
-    """Create a temporary Excel file that gets cleaned up after test."""
-    with tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False) as tmp:
-        temp_path = tmp.name
-    
-    # Create a basic Excel file
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "TempSheet"
-    ws.append(["Temp", "Data"])
-    ws.append(["Test", "Value"])
-    wb.save(temp_path)
-    
-    yield temp_path
-    
-    # Cleanup
-    try:
-        os.unlink(temp_path)
-    except (OSError, FileNotFoundError):
-        pass  # File might already be deleted
-
-
 # Helper functions to create specialized test files
 
-def create_comprehensive_xlsx(file_path):
-    """Create a comprehensive Excel file with multiple scenarios."""
+def create_all_fixtures_xlsx(file_path):
+    """Create a single Excel file containing every scenario sheet."""
     file_path.parent.mkdir(parents=True, exist_ok=True)
     
-    wb = Workbook()
-    wb.remove(wb.active)  # Remove default sheet
+    from openpyxl import Workbook
     
+    # Write-only workbooks stream rows to the file and start with no sheets
+    wb = Workbook(write_only=True)
+    add_comprehensive_sheets(wb)
+    add_edge_case_sheets(wb)
+    add_data_type_sheets(wb)
+    
+    # Save under a temporary name so parallel test workers never read a half-written file
+    temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    wb.save(temp_path)
+    os.replace(temp_path, file_path)
+
+
+def add_comprehensive_sheets(wb):
+    """Add the comprehensive scenario sheets to a workbook."""
     # Sheet 1: Standard data
     ws1 = wb.create_sheet("StandardData")
     ws1.append(["ID", "Name", "Department", "Salary", "Start Date"])
@@ -115,17 +120,10 @@ def create_comprehensive_xlsx(file_path):
     ws4.append(["String", "Integer", "Float", "Boolean", "Date"])
     ws4.append(["Text", 42, 3.14, True, date(2023, 1, 1)])
     ws4.append(["Another", 0, -2.5, False, date(2023, 12, 31)])
-    
-    wb.save(file_path)
 
 
-def create_edge_cases_xlsx(file_path):
-    """Create Excel file with edge case scenarios."""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    wb = Workbook()
-    wb.remove(wb.active)
-    
+def add_edge_case_sheets(wb):
+    """Add the edge case scenario sheets to a workbook."""
     # Sheet 1: Very long text
     ws1 = wb.create_sheet("LongText")
     long_text = "This is a very long text that goes on and on " * 50
@@ -145,29 +143,19 @@ def create_edge_cases_xlsx(file_path):
     # Sheet 3: Numbers as text and edge numeric values
     ws3 = wb.create_sheet("NumericEdges")
     ws3.append(["Description", "Value"])
-    ws3['A2'] = "Very large number"
-    ws3['B2'] = 999999999999999999
-    ws3['A3'] = "Very small decimal"
-    ws3['B3'] = 0.000000000001
-    ws3['A4'] = "Zero"
-    ws3['B4'] = 0
-    ws3['A5'] = "Negative"
-    ws3['B5'] = -12345
+    ws3.append(["Very large number", 999999999999999999])
+    ws3.append(["Very small decimal", 0.000000000001])
+    ws3.append(["Zero", 0])
+    ws3.append(["Negative", -12345])
     
     # Sheet 4: Empty sheet (only title)
     ws4 = wb.create_sheet("EmptyContent")
     # Don't add any content
-    
-    wb.save(file_path)
 
 
-def create_data_types_xlsx(file_path):
-    """Create Excel file focused on testing different data types."""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "DataTypes"
+def add_data_type_sheets(wb):
+    """Add the data type scenario sheet to a workbook."""
+    ws = wb.create_sheet("DataTypes")
     
     # Header
     ws.append(["Type", "Value", "Description"])
@@ -185,50 +173,111 @@ def create_data_types_xlsx(file_path):
     ws.append(["Whitespace", "   ", "Only whitespace"])
     ws.append(["Zero", 0, "Numeric zero"])
     ws.append(["Large Number", 1234567890123456789, "Very large number"])
-    
-    wb.save(file_path)
 
 
-def create_performance_test_xlsx(file_path, rows=1000):
-    """Create a large Excel file for performance testing."""
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "PerformanceTest"
-    
-    # Add header
-    ws.append(["ID", "Name", "Category", "Value", "Timestamp"])
+def fixture_cache_key(name, **params):
+    """Describe the generator version and parameters a cached fixture is built from."""
+    settings = "".join(f" {key}={value}" for key, value in sorted(params.items()))
+    return f"{name} v{FIXTURE_GENERATOR_VERSION}{settings}"
+
+
+def fixture_is_current(file_path, cache_key):
+    """Check that a generated fixture exists and was built with cache_key.
     
-    # Add many rows of data
-    import random
+    The key is kept in a .cache sidecar next to the workbook, so a new generator
+    version or different parameters rebuild the file instead of reusing it.
+    """
+    sidecar = file_path.with_name(file_path.name + ".cache")
+    return file_path.exists() and sidecar.exists() and sidecar.read_text() == cache_key
+
+
+def mark_fixture_current(file_path, cache_key):
+    """Record the cache key a fixture was just built with in its .cache sidecar."""
+    file_path.with_name(file_path.name + ".cache").write_text(cache_key)
+
+
+def performance_rows(rows, rng):
+    """Yield synthetic data rows for the performance workbook."""
     categories = ["Alpha", "Beta", "Gamma", "Delta", "Epsilon"]
+    start = datetime(2023, 1, 1)
+    span = (datetime(2023, 12, 31) - start).total_seconds()
     
     for i in range(1, rows + 1):
-        row = [
+        yield (
             i,
             f"Item_{i:06d}",
-            random.choice(categories),
-            random.randint(1, 10000),
-            datetime(2023, 1, 1) + (datetime(2023, 12, 31) - datetime(2023, 1, 1)) * random.random()
-        ]
-        ws.append(row)
-        
-        # Progress indicator for large files
+            categories[i % 5],
+            rng.randint(1, 10000),
+            start + timedelta(seconds=span * rng.random())
+        )
+
+
+def report_progress(rows_iter, total):
+    """Pass rows through, printing progress every 100 rows."""
+    for i, row in enumerate(rows_iter, 1):
+        yield row
         if i % 100 == 0:
-            print(f"Created {i}/{rows} rows")
+            print(f"Created {i}/{total} rows")
+
+
+def create_performance_test_xlsx(file_path, rows=1000, seed=0xC0FFEE):
+    """Create a large Excel file for performance testing.
+    
+    Content is generated from a seeded RNG so a rebuilt file has the same data.
+    xlsxwriter in constant_memory mode is used when installed, otherwise openpyxl.
+    The workbook is saved under a temporary name and moved into place, so
+    parallel test workers never see a half-written file.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    
+    # Stream many rows of data from a generator
+    data = performance_rows(rows, rng)
+    if os.environ.get('VERBOSE_FIXTURES'):
+        data = report_progress(data, rows)
     
-    wb.save(file_path)
+    temp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    if XLSXWRITER_AVAILABLE:
+        import xlsxwriter
+        options = {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'}
+        with xlsxwriter.Workbook(str(temp_path), options) as wb:
+            ws = wb.add_worksheet("PerformanceTest")
+            ws.write_row(0, 0, PERFORMANCE_HEADER)
+            for i, row in enumerate(data, 1):
+                ws.write_row(i, 0, row)
+    else:
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("PerformanceTest")
+        ws.append(PERFORMANCE_HEADER)
+        for row in data:
+            ws.append(row)
+        wb.save(temp_path)
+    
+    os.replace(temp_path, file_path)
+
+
+def pytest_addoption(parser):
+    """Add command-line options for sizing generated fixtures."""
+    parser.addoption(
+        "--perf-rows", type=int, default=200,
+        help="Number of data rows in the performance test workbook (CI uses 2000)"
+    )
 
 
 # Additional fixture for performance testing
 @pytest.fixture(scope="session")
-def performance_xlsx_file(fixtures_dir):
-    """Create a large Excel file for performance testing."""
-    file_path = fixtures_dir / "performance_test.xlsx"
-    if not file_path.exists():
+def performance_xlsx_file(fixtures_dir, request):
+    """Create a large Excel file for performance testing, sized by --perf-rows."""
+    rows = request.config.getoption("--perf-rows")
+    seed = 0xC0FFEE
+    # Row count in the name lets different sizes coexist in the fixtures directory
+    file_path = fixtures_dir / f"performance_test_{rows}.xlsx"
+    cache_key = fixture_cache_key("performance_test", rows=rows, seed=seed)
+    if not fixture_is_current(file_path, cache_key):
         print("Creating performance test file (this may take a moment)...")
-        create_performance_test_xlsx(file_path, rows=2000)
+        create_performance_test_xlsx(file_path, rows=rows, seed=seed)
+        mark_fixture_current(file_path, cache_key)
     return str(file_path)
 
 
@@ -261,31 +310,3 @@ def expected_sample_data():
         'expected_worksheets': ['Employees', 'Summary', 'Mixed Data']
     }
 
-
-# Utility fixture for creating custom test files on the fly
-@pytest.fixture
-def excel_file_factory(tmp_path):
-    """Factory for creating custom Excel files during tests."""
-    def _create_file(filename, sheets_data):
-        """
-        Create Excel file with custom data.
-        
-        Args:
-            filename: Name of the file
-            sheets_data: Dict with sheet_name -> list_of_rows
-        """
-        file_path = tmp_path / filename
-        wb = Workbook()
-        
-        # Remove default sheet
-        wb.remove(wb.active)
-        
-        for sheet_name, rows in sheets_data.items():
-            ws = wb.create_sheet(sheet_name)
-            for row in rows:
-                ws.append(row)
-        
-        wb.save(file_path)
-        return str(file_path)
-    
-    return _create_file
\ No newline at end of file
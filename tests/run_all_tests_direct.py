@@ -3,9 +3,13 @@
 Direct test runner that includes all test files.
 """
 
+import os
 import subprocess
 import sys
-from pathlib import Path
+from importlib.util import find_spec
+
+# pytest-xdist is optional; without it the files run serially
+XDIST_AVAILABLE = find_spec("xdist") is not None
 
 def run_all_tests_direct():
     """Run all available test files directly."""
@@ -19,11 +23,18 @@ def run_all_tests_direct():
         "test_coverage_boost.py"
     ]
     
-    # Find existing test files
+    # Find existing test files with one directory listing, falling back to
+    # tests/ so the runner also works from the repository root
+    search_dir = "."
+    present = set(os.listdir(search_dir))
+    if not present.intersection(test_files) and os.path.isdir("tests"):
+        search_dir = "tests"
+        present = set(os.listdir(search_dir))
+    
     existing_files = []
     for test_file in test_files:
-        if Path(test_file).exists():
-            existing_files.append(test_file)
+        if test_file in present:
+            existing_files.append(os.path.join(search_dir, test_file) if search_dir != "." else test_file)
             print(f"✓ Found: {test_file}")
         else:
             print(f"✗ Missing: {test_file}")
@@ -32,18 +43,34 @@ def run_all_tests_direct():
         print("❌ No test files found!")
         return False
     
-    print(f"\n🚀 Running {len(existing_files)} test files with coverage...")
+    # Coverage tracing slows the suite down, so it is opt-in
+    with_coverage = bool(os.environ.get('WITH_COVERAGE'))
+    mode = "with coverage" if with_coverage else "without coverage (set WITH_COVERAGE=1 to enable)"
+    print(f"\n🚀 Running {len(existing_files)} test files {mode}...")
     
-    # Run pytest with coverage
     cmd = [
         sys.executable, "-m", "pytest",
-        "--cov=excel_dumper",
-        "--cov-report=term-missing",
-        "--cov-report=html",
-        "--cov-report=xml", 
+        "-p", "no:cacheprovider",
+        "--import-mode=importlib",
         "-v",
         "--tb=short"
-    ] + existing_files
+    ]
+    
+    if with_coverage:
+        cmd += [
+            "--cov=excel_dumper",
+            "--cov-report=term-missing",
+            "--cov-report=html",
+            "--cov-report=xml"
+        ]
+    
+    # Spread test files across CPU cores, keeping each file on one worker
+    if XDIST_AVAILABLE:
+        cmd += ["-n", "auto", "--dist=loadfile"]
+    else:
+        print("pytest-xdist not installed, running tests serially")
+    
+    cmd += existing_files
     
     print("Executing:", " ".join(cmd[:8]) + "... [test files]")
     print("=" * 60)
@@ -53,9 +80,10 @@ def run_all_tests_direct():
         
         if result.returncode == 0:
             print("\n🎉 ALL TESTS PASSED!")
-            print("\n📊 Coverage Analysis:")
-            print("- Coverage report: htmlcov/index.html")
-            print("- XML report: coverage.xml")
+            if with_coverage:
+                print("\n📊 Coverage Analysis:")
+                print("- Coverage report: htmlcov/index.html")
+                print("- XML report: coverage.xml")
             return True
         else:
             print(f"\n❌ Tests failed with return code: {result.returncode}")
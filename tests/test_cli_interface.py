@@ -6,15 +6,21 @@ Tests the main() function and command-line argument parsing.
 import pytest
 import sys
 import os
-import tempfile
+import shutil
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import subprocess
 
 # Import the functions we're testing
 from excel_dumper.dumper import main, show_help
 
 
+@pytest.fixture(autouse=True)
+def no_xlsx2csv(monkeypatch):
+    """Pin the pandas reader so patched iter_excel_data is used even when xlsx2csv is installed."""
+    monkeypatch.setattr('excel_dumper.dumper.XLSX2CSV_AVAILABLE', False)
+
+
 class TestCLIInterface:
     """Test command-line interface functionality."""
     
@@ -38,12 +44,9 @@ class TestCLIInterface:
         print("✓ Help function displays expected content")
     
     
-    @patch('sys.argv')
-    def test_main_with_help_argument(self, mock_argv, capsys):
+    def test_main_with_help_argument(self, monkeypatch, capsys):
         """Test main function with -help argument."""
-        mock_argv.__getitem__.side_effect = lambda x: ['-help'][x] if x == 1 else ['script_name'][x]
-        mock_argv.__contains__ = lambda self, x: x == '-help'
-        mock_argv.__iter__ = lambda: iter(['script_name', '-help'])
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-help'])
         
         # Should exit cleanly after showing help
         main()
@@ -54,322 +57,286 @@ class TestCLIInterface:
         print("✓ Help argument works correctly")
     
     
-    @patch('sys.argv')
-    @patch('excel_dumper.dumper.extract_excel_data')
+    @patch('excel_dumper.dumper.iter_excel_data')
     @patch('excel_dumper.dumper.write_to_csv')
     @patch('os.path.exists')
-    def test_main_with_file_argument(self, mock_exists, mock_write_csv, mock_extract, mock_argv, tmp_path):
+    def test_main_with_file_argument(self, mock_exists, mock_write_csv, mock_extract, monkeypatch, cli_dummy_xlsx):
         """Test main function with -file argument."""
-        test_file = tmp_path / "test.xlsx"
-        test_file.touch()
+        test_file = cli_dummy_xlsx
         
-        # Mock sys.argv
-        mock_argv.__getitem__.side_effect = ['script_name', '-file', str(test_file)].__getitem__
-        mock_argv.__contains__ = lambda self, x: x in ['-file', str(test_file)]
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', str(test_file)])
         
         # Mock dependencies
         mock_exists.return_value = True
         mock_extract.return_value = [['Sheet1', 'Data1', 'Data2']]
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = str(test_file)
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.input_dir = None
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            main()
-            
-            # Verify extraction was called
-            mock_extract.assert_called_once()
-            mock_write_csv.assert_called_once()
-            
+        main()
+        
+        # Verify extraction was called
+        mock_extract.assert_called_once()
+        mock_write_csv.assert_called_once()
+        
         print("✓ File argument processing works")
     
     
-    @patch('sys.argv') 
     @patch('excel_dumper.dumper.find_newest_excel_file')
-    @patch('excel_dumper.dumper.extract_excel_data')
+    @patch('excel_dumper.dumper.iter_excel_data')
     @patch('excel_dumper.dumper.write_to_csv')
-    def test_main_without_file_finds_newest(self, mock_write_csv, mock_extract, mock_find_newest, mock_argv, tmp_path):
+    def test_main_without_file_finds_newest(self, mock_write_csv, mock_extract, mock_find_newest, monkeypatch, cli_dummy_xlsx):
         """Test main function finds newest file when no file specified."""
-        test_file = tmp_path / "newest.xlsx"
-        test_file.touch()
+        test_file = cli_dummy_xlsx
         
-        # Mock sys.argv to have no -file argument
-        mock_argv.__getitem__.side_effect = ['script_name'].__getitem__
-        mock_argv.__contains__ = lambda self, x: False
+        # No -file argument
+        monkeypatch.setattr(sys, 'argv', ['script_name'])
         
         # Mock dependencies
         mock_find_newest.return_value = str(test_file)
         mock_extract.return_value = [['Sheet1', 'Data1', 'Data2']]
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = None
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.input_dir = None
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            main()
-            
-            # Verify newest file search was called
-            mock_find_newest.assert_called_once_with(".")
-            mock_extract.assert_called_once()
-            
+        main()
+        
+        # Verify newest file search was called
+        mock_find_newest.assert_called_once_with(".")
+        mock_extract.assert_called_once()
+        
         print("✓ Newest file search works")
     
     
-    @patch('sys.argv')
-    @patch('excel_dumper.dumper.extract_excel_data')
+    @patch('excel_dumper.dumper.iter_excel_data')
     @patch('excel_dumper.dumper.write_to_json')
     @patch('os.path.exists')
-    def test_main_with_json_output(self, mock_exists, mock_write_json, mock_extract, mock_argv, tmp_path):
+    def test_main_with_json_output(self, mock_exists, mock_write_json, mock_extract, monkeypatch, cli_dummy_xlsx):
         """Test main function with JSON output option."""
-        test_file = tmp_path / "test.xlsx"
-        test_file.touch()
+        test_file = cli_dummy_xlsx
+        
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', str(test_file), '-json'])
         
         mock_exists.return_value = True
         mock_extract.return_value = [['Sheet1', 'Data1', 'Data2']]
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = str(test_file)
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.input_dir = None
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = True  # JSON output
-            mock_parse.return_value = mock_args
-            
-            main()
-            
-            # Verify JSON writer was called
-            mock_write_json.assert_called_once()
-            
+        main()
+        
+        # Verify JSON writer was called
+        mock_write_json.assert_called_once()
+        
         print("✓ JSON output option works")
     
     
-    @patch('sys.argv')
-    @patch('excel_dumper.dumper.extract_excel_data')
+    @patch('excel_dumper.dumper.iter_excel_data')
     @patch('excel_dumper.dumper.write_to_csv')
     @patch('os.path.exists')
-    def test_main_with_all_options(self, mock_exists, mock_write_csv, mock_extract, mock_argv, tmp_path):
+    def test_main_with_all_options(self, mock_exists, mock_write_csv, mock_extract, monkeypatch, cli_dummy_xlsx):
         """Test main function with all options enabled."""
-        test_file = tmp_path / "test.xlsx"
-        test_file.touch()
+        test_file = cli_dummy_xlsx
+        
+        monkeypatch.setattr(sys, 'argv', [
+            'script_name', '-file', str(test_file), '-no-hide',
+            '-output', str(test_file.parent), '-formulas', '-rownumbers'
+        ])
         
         mock_exists.return_value = True
         mock_extract.return_value = [['Sheet1', 1, 'Data1', 'Data2']]
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = str(test_file)
-            mock_args.no_hide = True  # Skip hidden sheets
-            mock_args.output_dir = str(tmp_path)
-            mock_args.input_dir = None
-            mock_args.formulas = True  # Include formulas
-            mock_args.rownumbers = True  # Include row numbers
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            main()
-            
-            # Verify extraction was called with correct options
-            # Verify extract_excel_data was called with correct arguments
-            call_args = mock_extract.call_args
-            assert call_args[0][0] == str(test_file)  # filename
-            assert call_args[0][1] == False  # include_hidden
-            assert call_args[0][2] == True   # include_row_numbers
-            assert call_args[0][3] == True   # include_formulas
-            
+        main()
+        
+        # Verify extraction was called with correct options
+        # Verify extract_excel_data was called with correct arguments
+        call_args = mock_extract.call_args
+        assert call_args[0][0] == str(test_file)  # filename
+        assert call_args[0][1] == False  # include_hidden
+        assert call_args[0][2] == True   # include_row_numbers
+        assert call_args[0][3] == True   # include_formulas
+        
         print("✓ All options work correctly")
     
     
-    @patch('sys.argv')
     @patch('os.path.exists')
-    def test_main_file_not_found_error(self, mock_exists, mock_argv, capsys):
+    def test_main_file_not_found_error(self, mock_exists, monkeypatch, capsys):
         """Test main function handles file not found error."""
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', 'nonexistent.xlsx'])
         mock_exists.return_value = False
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = "nonexistent.xlsx"
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.input_dir = None
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            with pytest.raises(SystemExit):
-                main()
-            
-            captured = capsys.readouterr()
-            assert "not found" in captured.out
-            
+        with pytest.raises(SystemExit):
+            main()
+        
+        captured = capsys.readouterr()
+        assert "not found" in captured.out
+        
         print("✓ File not found error handled correctly")
     
     
-    @patch('sys.argv')
     @patch('excel_dumper.dumper.find_newest_excel_file')
-    def test_main_no_excel_files_found_error(self, mock_find_newest, mock_argv, capsys):
+    def test_main_no_excel_files_found_error(self, mock_find_newest, monkeypatch, capsys):
         """Test main function handles no Excel files found error."""
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-input', '.'])
         mock_find_newest.side_effect = FileNotFoundError("No Excel files found")
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = None
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.input_dir = "."
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            with pytest.raises(SystemExit):
-                main()
-            
-            captured = capsys.readouterr()
-            assert "Error:" in captured.out
-            
+        with pytest.raises(SystemExit):
+            main()
+        
+        captured = capsys.readouterr()
+        assert "Error:" in captured.out
+        
         print("✓ No Excel files error handled correctly")
     
     
-    @patch('sys.argv')
-    @patch('excel_dumper.dumper.extract_excel_data')
+    @patch('excel_dumper.dumper.iter_excel_data')
     @patch('os.path.exists')
-    def test_main_extraction_error(self, mock_exists, mock_extract, mock_argv, capsys):
+    def test_main_extraction_error(self, mock_exists, mock_extract, monkeypatch, capsys):
         """Test main function handles extraction errors."""
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', 'test.xlsx'])
         mock_exists.return_value = True
         mock_extract.side_effect = Exception("Extraction failed")
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = "test.xlsx"
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.input_dir = None
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            with pytest.raises(SystemExit):
-                main()
-            
-            captured = capsys.readouterr()
-            assert "Error:" in captured.out
-            
+        with pytest.raises(SystemExit):
+            main()
+        
+        captured = capsys.readouterr()
+        assert "Error:" in captured.out
+        
         print("✓ Extraction error handled correctly")
+    
+    
+    @patch('excel_dumper.dumper.iter_xlsx2csv_rows')
+    @patch('excel_dumper.dumper.write_to_csv')
+    def test_main_fast_uses_xlsx2csv(self, mock_write_csv, mock_xlsx2csv, monkeypatch, cli_dummy_xlsx):
+        """Test that -fast reads CSV exports through xlsx2csv."""
+        monkeypatch.setattr('excel_dumper.dumper.XLSX2CSV_AVAILABLE', True)
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', str(cli_dummy_xlsx), '-fast'])
+        mock_xlsx2csv.return_value = iter([['Sheet1', 'Data1', 'Data2']])
+        
+        main()
+        
+        mock_xlsx2csv.assert_called_once_with(str(cli_dummy_xlsx), True)
+        mock_write_csv.assert_called_once()
+        
+        print("✓ -fast uses xlsx2csv")
+    
+    
+    def test_main_fast_requires_xlsx2csv(self, monkeypatch, cli_dummy_xlsx, capsys):
+        """Test that -fast exits with an error when xlsx2csv and python-calamine are missing."""
+        monkeypatch.setattr('excel_dumper.dumper.XLSX2CSV_AVAILABLE', False)
+        monkeypatch.setattr('excel_dumper.dumper.CALAMINE_AVAILABLE', False)
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', str(cli_dummy_xlsx), '-fast'])
+        
+        with pytest.raises(SystemExit):
+            main()
+        
+        captured = capsys.readouterr()
+        assert "xlsx2csv" in captured.out
+        
+        print("✓ -fast without xlsx2csv is reported")
+    
+    
+    @pytest.mark.parametrize("option", ['-nrows', '-skiprows'])
+    def test_main_rejects_negative_row_counts(self, option, monkeypatch, cli_dummy_xlsx, capsys):
+        """Test that negative -nrows/-skiprows are rejected by argparse."""
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', str(cli_dummy_xlsx), option, '-1'])
+        
+        with pytest.raises(SystemExit):
+            main()
+        
+        captured = capsys.readouterr()
+        assert "must be zero or greater" in captured.err
+        
+        print(f"✓ Negative {option} rejected")
 
 
 class TestCLIArgumentParsing:
     """Test specific argument parsing scenarios."""
     
-    def test_relative_filename_with_input_dir(self, tmp_path):
+    def test_relative_filename_with_input_dir(self, monkeypatch, cli_dummy_xlsx):
         """Test relative filename combined with input directory."""
-        # Create test structure
-        input_dir = tmp_path / "input"
-        input_dir.mkdir()
-        test_file = input_dir / "test.xlsx"
-        test_file.touch()
-        
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = "test.xlsx"  # Relative filename
-            mock_args.input_dir = str(input_dir)  # Input directory
-            mock_args.no_hide = False
-            mock_args.output_dir = None
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            with patch('excel_dumper.dumper.extract_excel_data') as mock_extract:
-                with patch('excel_dumper.dumper.write_to_csv') as mock_write:
-                    mock_extract.return_value = [['Sheet1', 'Data']]
-                    
-                    main()
-                    
-                    # Should have combined input_dir + filename
-                    expected_path = str(input_dir / "test.xlsx")
-                    mock_extract.assert_called_once()
-                    call_args = mock_extract.call_args[0]
-                    assert expected_path in call_args[0] or call_args[0].endswith("test.xlsx")
+        input_dir = cli_dummy_xlsx.parent
+        
+        # Relative filename plus an input directory
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', 'test.xlsx', '-input', str(input_dir)])
+        
+        with patch('excel_dumper.dumper.iter_excel_data') as mock_extract:
+            with patch('excel_dumper.dumper.write_to_csv') as mock_write:
+                mock_extract.return_value = [['Sheet1', 'Data']]
+                
+                main()
+                
+                # Should have combined input_dir + filename
+                expected_path = str(input_dir / "test.xlsx")
+                mock_extract.assert_called_once()
+                call_args = mock_extract.call_args[0]
+                assert expected_path in call_args[0] or call_args[0].endswith("test.xlsx")
         
         print("✓ Relative filename with input directory works")
     
     
-    def test_output_directory_creation(self, tmp_path):
+    def test_output_directory_creation(self, monkeypatch, cli_dummy_xlsx, tmp_path):
         """Test that output directory is created if it doesn't exist."""
-        input_file = tmp_path / "test.xlsx"
-        input_file.touch()
+        input_file = cli_dummy_xlsx
         
         output_dir = tmp_path / "output" / "subdir"  # Nested directory that doesn't exist
+        monkeypatch.setattr(sys, 'argv', ['script_name', '-file', str(input_file), '-output', str(output_dir)])
         
-        with patch('argparse.ArgumentParser.parse_args') as mock_parse:
-            mock_args = MagicMock()
-            mock_args.filename = str(input_file)
-            mock_args.input_dir = None
-            mock_args.output_dir = str(output_dir)
-            mock_args.no_hide = False
-            mock_args.formulas = False
-            mock_args.rownumbers = False
-            mock_args.json = False
-            mock_parse.return_value = mock_args
-            
-            with patch('excel_dumper.dumper.extract_excel_data') as mock_extract:
-                with patch('excel_dumper.dumper.write_to_csv') as mock_write:
-                    mock_extract.return_value = [['Sheet1', 'Data']]
-                    
-                    main()
-                    
-                    # Verify output directory creation would be attempted
-                    mock_write.assert_called_once()
+        with patch('excel_dumper.dumper.iter_excel_data') as mock_extract:
+            with patch('excel_dumper.dumper.write_to_csv') as mock_write:
+                mock_extract.return_value = [['Sheet1', 'Data']]
+                
+                main()
+                
+                # Verify output directory creation would be attempted
+                mock_write.assert_called_once()
         
         print("✓ Output directory handling works")
 
 
-def test_cli_integration_subprocess(tmp_path):
-    """Integration test using subprocess to test actual CLI."""
-    # Create a test Excel file using openpyxl
+def test_cli_integration_in_process(temp_excel_template, tmp_path, monkeypatch, capsys):
+    """Integration test running the real CLI end to end inside the test process."""
+    test_file = tmp_path / "cli_test.xlsx"
+    shutil.copyfile(temp_excel_template, test_file)
+    
+    monkeypatch.setattr(sys, 'argv', ['excel_dumper', '-file', str(test_file), '-output', str(tmp_path)])
+    main()
+    
+    captured = capsys.readouterr()
+    assert "successfully exported" in captured.out
+    assert len(list(tmp_path.glob("dumperpy_cli_test_*.csv"))) == 1
+    
+    print("✓ CLI integration test passed")
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not os.environ.get('RUN_SLOW_TESTS'), reason="set RUN_SLOW_TESTS=1 to run subprocess smoke tests")
+def test_cli_integration_subprocess(temp_excel_template, tmp_path):
+    """Smoke test the real module entry point in a fresh interpreter."""
+    # Reuse the session workbook template rather than building one here
     test_file = tmp_path / "cli_test.xlsx"
+    shutil.copyfile(temp_excel_template, test_file)
+    
+    # Make the package importable from the temporary working directory
+    project_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ, PYTHONPATH=project_root)
+    
+    result = subprocess.run([
+        sys.executable, "-m", "excel_dumper.dumper",
+        "-file", str(test_file)
+    ], capture_output=True, text=True, cwd=tmp_path, env=env)
+    
+    assert result.returncode == 0, result.stderr
+    assert "successfully exported" in result.stdout
+    
+    print("✓ CLI subprocess smoke test passed")
+
+
+def test_cli_help_does_not_import_pandas():
+    """Test that -help runs without loading the Excel reading libraries."""
+    script = (
+        "import sys; sys.argv = ['dumper', '-help']\n"
+        "from excel_dumper.dumper import main; main()\n"
+        "assert 'pandas' not in sys.modules and 'openpyxl' not in sys.modules\n"
+    )
+    project_root = Path(__file__).resolve().parent.parent
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, cwd=project_root)
     
-    try:
-        import openpyxl
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.append(["Name", "Value"])
-        ws.append(["Test", 123])
-        wb.save(test_file)
-        
-        # Test the CLI with subprocess
-        result = subprocess.run([
-            sys.executable, "-m", "excel_dumper.dumper",
-            "-file", str(test_file)
-        ], capture_output=True, text=True, cwd=tmp_path)
-        
-        # Check that it ran without crashing
-        assert result.returncode == 0 or "successfully exported" in result.stdout
-        
-        print("✓ CLI integration test passed")
-        
-    except ImportError:
-        pytest.skip("openpyxl not available for integration test")
-    except Exception as e:
-        print(f"⚠️  CLI integration test failed (this may be expected): {e}")
+    assert result.returncode == 0, result.stderr
+    assert "USAGE" in result.stdout.upper()
+    print("✓ -help skips heavy imports")
 
 
 if __name__ == "__main__":
@@ -141,6 +141,18 @@ def test_package_level_imports():
     print("✓ Package-level imports work")
 
 
+def test_check_dependencies_reports_missing_calamine():
+    """Test that python-calamine is reported from package metadata, missing or not."""
+    from importlib.metadata import PackageNotFoundError
+    from excel_dumper import check_dependencies
+    
+    with patch('importlib.metadata.version', side_effect=PackageNotFoundError('python-calamine')):
+        dependencies = check_dependencies()
+    
+    assert dependencies['python-calamine'] == {'available': False, 'version': None}
+    print("✓ Missing python-calamine reported")
+
+
 def test_file_format_validation():
     """Test file format validation edge cases (lines 70-71)."""
     from excel_dumper.dumper import extract_excel_data
@@ -5,6 +5,7 @@ Core Excel extraction tests for excel_dumper.
 import pytest
 import tempfile
 from pathlib import Path
+from datetime import datetime
 import openpyxl
 from openpyxl import Workbook
 
@@ -111,6 +112,17 @@ class TestExcelExtraction:
         assert 'Hidden' not in worksheet_names
         
         print(f"✓ Hidden sheets excluded: {worksheet_names}")
+    
+    
+    def test_extract_hidden_sheets_excluded_without_calamine(self, hidden_sheets_file, monkeypatch):
+        """Test that the openpyxl visibility check is used when calamine is unavailable."""
+        from excel_dumper import dumper
+        
+        monkeypatch.setattr(dumper, 'CALAMINE_AVAILABLE', False)
+        result = extract_excel_data(hidden_sheets_file, include_hidden=False)
+        
+        assert {row[0] for row in result} == {'Visible'}
+        print("✓ Hidden sheets excluded without calamine")
 
 
     def test_extract_empty_file(self, empty_xlsx_file):
@@ -170,6 +182,17 @@ class TestExcelExtraction:
         print(f"✓ Empty rows filtered correctly from {len(result)} rows")
 
 
+    def test_extract_empty_cells_are_none(self, excel_file_factory):
+        """Test that empty cells inside a row come back as None on both read paths."""
+        file_path = excel_file_factory("gaps.xlsx", {"Gaps": [["a", None, "b"], [None, 2, None]]})
+        
+        for include_formulas in (False, True):
+            result = extract_excel_data(file_path, include_formulas=include_formulas)
+            assert result == [["Gaps", "a", None, "b"], ["Gaps", None, 2, None]]
+        
+        print("✓ Empty cells are returned as None")
+    
+    
     def test_extract_with_all_options(self, sample_xlsx_file):
         """Test extraction with all options enabled."""
         result = extract_excel_data(
@@ -188,6 +211,148 @@ class TestExcelExtraction:
             assert isinstance(row[1], int)  # Row number
         
         print(f"✓ All options test passed with {len(result)} rows")
+    
+    
+    def test_extract_parallel_matches_serial(self, sample_xlsx_file):
+        """Test that extracting sheets in worker processes keeps rows and sheet order."""
+        for include_formulas in (False, True):
+            serial = extract_excel_data(sample_xlsx_file, include_row_numbers=True,
+                                        include_formulas=include_formulas)
+            parallel = extract_excel_data(sample_xlsx_file, include_row_numbers=True,
+                                          include_formulas=include_formulas, max_workers=2)
+            assert repr(parallel) == repr(serial)  # NaN != NaN, so compare representations
+        
+        print(f"✓ Parallel extraction matches serial for {len(serial)} rows")
+    
+    
+    def test_extract_row_window(self, sample_xlsx_file):
+        """Test that nrows/skiprows bound each sheet and keep worksheet row numbers."""
+        for include_formulas in (False, True):
+            result = extract_excel_data(sample_xlsx_file, include_row_numbers=True,
+                                        include_formulas=include_formulas, nrows=2, skiprows=1)
+            full = extract_excel_data(sample_xlsx_file, include_row_numbers=True,
+                                      include_formulas=include_formulas)
+            
+            expected = [row for row in full if 2 <= row[1] <= 3]
+            assert repr(result) == repr(expected)  # NaN != NaN, so compare representations
+            
+            # An empty window reads nothing on both the pandas and openpyxl paths
+            assert extract_excel_data(sample_xlsx_file, include_formulas=include_formulas, nrows=0) == []
+        
+        print(f"✓ Row window returned {len(result)} rows")
+    
+    
+    def test_dump_excel_to_csv_streams_rows(self, sample_xlsx_file, empty_xlsx_file, tmp_path):
+        """Test the fused extract-and-write path against extract_excel_data."""
+        from excel_dumper.dumper import dump_excel_to_csv
+        
+        output_file = tmp_path / "dump.csv"
+        row_count = dump_excel_to_csv(sample_xlsx_file, str(output_file), include_row_numbers=True)
+        
+        assert row_count == len(extract_excel_data(sample_xlsx_file, include_row_numbers=True))
+        assert len(output_file.read_text(encoding='utf-8').splitlines()) == row_count + 1
+        
+        empty_output = tmp_path / "empty.csv"
+        assert dump_excel_to_csv(empty_xlsx_file, str(empty_output)) == 0
+        assert not empty_output.exists()
+        
+        print(f"✓ dump_excel_to_csv wrote {row_count} rows")
+    
+    
+    def test_dump_excel_to_json_streams_rows(self, sample_xlsx_file, empty_xlsx_file, tmp_path):
+        """Test the fused JSON path writes the same file as extract_excel_data + write_to_json."""
+        from excel_dumper.dumper import dump_excel_to_json, write_to_json
+        
+        streamed_file = tmp_path / "streamed.json"
+        listed_file = tmp_path / "listed.json"
+        row_count = dump_excel_to_json(sample_xlsx_file, str(streamed_file), include_row_numbers=True)
+        write_to_json(extract_excel_data(sample_xlsx_file, include_row_numbers=True), str(listed_file), True)
+        
+        assert row_count > 0
+        assert streamed_file.read_bytes() == listed_file.read_bytes()
+        
+        empty_output = tmp_path / "empty.json"
+        assert dump_excel_to_json(empty_xlsx_file, str(empty_output)) == 0
+        assert not empty_output.exists()
+        
+        print(f"✓ dump_excel_to_json wrote {row_count} rows")
+
+
+class TestScenarioWorkbooks:
+    """Test extraction against the scenario workbooks from enhanced_conftest."""
+    
+    def test_comprehensive_scenarios(self, comprehensive_xlsx_file):
+        """Test that every comprehensive sheet is extracted and empty rows are dropped."""
+        file_path, sheet_names = comprehensive_xlsx_file
+        result = extract_excel_data(file_path)
+        
+        for sheet_name in sheet_names:
+            assert any(row[0] == sheet_name for row in result)
+        
+        # Header, two data rows and the final row; the all-empty rows are skipped
+        empty_rows_sheet = [row for row in result if row[0] == "WithEmptyRows"]
+        assert len(empty_rows_sheet) == 4
+        assert empty_rows_sheet[-1][1:] == ["Final", "Row", "Data"]
+        
+        print(f"✓ Comprehensive scenarios extracted {len(result)} rows")
+    
+    
+    def test_edge_case_scenarios(self, edge_cases_xlsx_file):
+        """Test long text, special characters and empty sheets."""
+        file_path, sheet_names = edge_cases_xlsx_file
+        # The scenario fixtures share one workbook, so keep only this scenario's sheets
+        result = [row for row in extract_excel_data(file_path) if row[0] in sheet_names]
+        extracted_sheets = {row[0] for row in result}
+        
+        assert extracted_sheets == set(sheet_names) - {"EmptyContent"}
+        assert ["SpecialChars", "Unicode", "Ñoñó 中文 العربية 🎉"] in result
+        assert ["SpecialChars", "Newlines", "Text\nwith\nnewlines"] in result
+        long_text = next(row[2] for row in result if row[0] == "LongText" and row[1] == 1)
+        assert len(long_text) == len("This is a very long text that goes on and on " * 50)
+        
+        print("✓ Edge case scenarios extracted")
+    
+    
+    def test_data_type_scenarios(self, data_types_xlsx_file):
+        """Test that typed cells come back with their types."""
+        file_path, sheet_names = data_types_xlsx_file
+        result = [row for row in extract_excel_data(file_path) if row[0] in sheet_names]
+        
+        assert len(result) == 13
+        values = {row[1]: row[2] for row in result}
+        assert values["String"] == "Hello World"
+        assert values["Integer"] == 42
+        assert values["Float"] == 3.14159
+        assert values["DateTime"] == datetime(2023, 6, 15, 14, 30)
+        
+        print("✓ Data type scenarios extracted")
+    
+    
+    def test_corrupted_file_raises(self, corrupted_file_simulation):
+        """Test that a non-Excel file reports an error."""
+        with pytest.raises(Exception):
+            extract_excel_data(corrupted_file_simulation)
+        
+        print("✓ Corrupted file raises an error")
+    
+    
+    def test_readonly_file_is_readable(self, readonly_excel_file):
+        """Test that extraction only needs read access."""
+        result = extract_excel_data(readonly_excel_file)
+        
+        assert result == [["TempSheet", "Temp", "Data"], ["TempSheet", "Test", "Value"]]
+        print("✓ Read-only file extracted")
+    
+    
+    def test_performance_workbook(self, performance_xlsx_file, request):
+        """Test that the performance workbook holds --perf-rows data rows plus a header."""
+        rows = request.config.getoption("--perf-rows")
+        result = extract_excel_data(performance_xlsx_file)
+        
+        assert len(result) == rows + 1
+        assert result[0] == ["PerformanceTest", "ID", "Name", "Category", "Value", "Timestamp"]
+        assert result[-1][1] == rows
+        print(f"✓ Performance workbook has {rows} rows")
 
 
 def test_has_non_null_data():
@@ -208,6 +373,34 @@ def test_has_non_null_data():
     print("✓ has_non_null_data utility function works correctly")
 
 
+def test_non_empty_row_mask_matches_has_non_null_data():
+    """Test the vectorised row filter agrees with has_non_null_data, treating NaN as null."""
+    import pandas as pd
+    from excel_dumper.dumper import non_empty_row_mask
+    
+    rows = [
+        ['value', None, None],
+        [None, None, None],
+        ['', '   ', None],
+        [0, None, ''],
+        [False, None, None],
+        [float('nan'), None, '  x  '],
+    ]
+    df = pd.DataFrame(rows, dtype=object)
+    
+    assert non_empty_row_mask(df).tolist() == [True, False, False, True, True, True]
+    assert [has_non_null_data(row) for row in rows] == non_empty_row_mask(df).tolist()
+    assert has_non_null_data([float('nan'), None, '\t']) == False
+    
+    # Nullable-dtype frames hold pd.NA, which cannot be truth-tested
+    nullable = pd.DataFrame({'a': pd.array([1, None], dtype='Int64'), 'b': pd.array([None, None], dtype='string')})
+    nullable_rows = nullable.astype(object).values.tolist()
+    assert [has_non_null_data(row) for row in nullable_rows] == non_empty_row_mask(nullable).tolist() == [True, False]
+    assert has_non_null_data([pd.NA, pd.NaT, None]) == False
+    
+    print("✓ non_empty_row_mask filters rows correctly")
+
+
 def test_extract_excel_data_function_signature():
     """Test that the extract_excel_data function has the expected signature."""
     import inspect
@@ -227,3 +420,98 @@ def test_extract_excel_data_function_signature():
     assert sig.parameters['include_formulas'].default == False
     
     print("✓ Function signature is correct")
+
+
+def test_excel_engine_for_extensions(monkeypatch):
+    """Test the pandas engine chosen for each Excel extension."""
+    from excel_dumper import dumper
+    
+    monkeypatch.setattr(dumper, 'CALAMINE_AVAILABLE', False)
+    assert dumper.excel_engine_for('report.XLSX') == 'openpyxl'
+    assert dumper.excel_engine_for('legacy.xls') == 'xlrd'
+    assert dumper.excel_engine_for('binary.xlsb') == 'pyxlsb'
+    assert dumper.excel_engine_for('data.csv') is None
+    
+    monkeypatch.setattr(dumper, 'CALAMINE_AVAILABLE', True)
+    # calamine is opt-in, even when installed
+    assert dumper.excel_engine_for('report.xlsx') == 'openpyxl'
+    assert dumper.excel_engine_for('binary.xlsb', fast=True) == 'calamine'
+    assert dumper.excel_engine_for('data.csv', fast=True) is None
+    
+    print("✓ Engine dispatch is correct")
+
+
+@pytest.mark.parametrize("include_hidden", [True, False])
+def test_calamine_matches_openpyxl_on_fixtures(include_hidden, sample_xlsx_file, formulas_xlsx_file,
+                                                hidden_sheets_file, all_fixtures_workbook):
+    """Test that -fast (calamine) reads the fixture workbooks like the default engine."""
+    from excel_dumper import dumper
+    
+    if not dumper.CALAMINE_AVAILABLE:
+        pytest.skip("python-calamine not installed")
+    
+    for path in (sample_xlsx_file, formulas_xlsx_file, hidden_sheets_file, all_fixtures_workbook):
+        default_rows = extract_excel_data(str(path), include_hidden=include_hidden)
+        fast_rows = extract_excel_data(str(path), include_hidden=include_hidden, fast=True)
+        assert len(fast_rows) == len(default_rows)
+        
+        for default_row, fast_row in zip(default_rows, fast_rows):
+            # calamine reads whitespace-only text as an empty cell; everything else matches
+            expected = [None if isinstance(value, str) and value and not value.strip() else value
+                        for value in default_row]
+            assert fast_row == expected
+    
+    # The default engine keeps the whitespace-only cell of the DataTypes sheet
+    default_rows = extract_excel_data(str(all_fixtures_workbook), include_hidden=include_hidden)
+    assert ['DataTypes', 'Whitespace', '   ', 'Only whitespace'] in default_rows
+    
+    print("✓ calamine matches openpyxl apart from whitespace-only cells")
+
+
+def test_iter_csv_rows_falls_back_without_xlsx2csv(monkeypatch, sample_xlsx_file):
+    """Test that CSV rows come from iter_excel_data unless the xlsx2csv path is requested and usable."""
+    from excel_dumper import dumper
+    
+    monkeypatch.setattr(dumper, 'XLSX2CSV_AVAILABLE', False)
+    rows = list(dumper.iter_csv_rows(sample_xlsx_file, fast=True))
+    assert repr(rows) == repr(extract_excel_data(sample_xlsx_file))
+    
+    # Even when installed, xlsx2csv is only used on request
+    monkeypatch.setattr(dumper, 'XLSX2CSV_AVAILABLE', True)
+    rows = list(dumper.iter_csv_rows(sample_xlsx_file))
+    assert repr(rows) == repr(extract_excel_data(sample_xlsx_file))
+    
+    # Row numbers need cell metadata, so the fast path is skipped even when requested
+    rows = list(dumper.iter_csv_rows(sample_xlsx_file, include_row_numbers=True, fast=True))
+    assert all(isinstance(row[1], int) for row in rows)
+    
+    print("✓ CSV row source falls back correctly")
+
+
+def test_xlsx2csv_fast_path_matches_pandas(excel_file_factory, tmp_path):
+    """Test that -fast CSV output matches the pandas path for text and integer cells."""
+    pytest.importorskip("xlsx2csv")
+    from excel_dumper.dumper import dump_excel_to_csv
+    
+    test_file = excel_file_factory("fast.xlsx", {
+        "People": [["Name", "Age", "City"], ["Alice", 30, "Paris"], ["Bob", 25, "Oslo, Norway"]],
+        "Notes": [["Quote", 'Say "hi"'], ["Unicode", "Ñoñó 中文"]],
+    })
+    
+    pandas_csv = tmp_path / "pandas.csv"
+    fast_csv = tmp_path / "fast.csv"
+    assert dump_excel_to_csv(test_file, str(pandas_csv)) == 5
+    assert dump_excel_to_csv(test_file, str(fast_csv), fast=True) == 5
+    
+    assert fast_csv.read_bytes() == pandas_csv.read_bytes()
+    print("✓ xlsx2csv fast path matches pandas output")
+
+
+def test_hidden_sheet_names_reads_workbook_part(hidden_sheets_file, sample_xlsx_file):
+    """Test hidden sheet detection from the workbook XML part."""
+    from excel_dumper.dumper import hidden_sheet_names
+    
+    assert hidden_sheet_names(hidden_sheets_file) == {'Hidden'}
+    assert hidden_sheet_names(sample_xlsx_file) == set()
+    
+    print("✓ Hidden sheet names read correctly")
@@ -92,6 +92,38 @@ class TestFindNewestExcelFile:
         print("✓ Nonexistent directory error handled correctly")
 
 
+    def test_excel_file_entries_filters_directory(self, tmp_path):
+        """Test the shared directory scan used by find_newest_excel_file and batch_process."""
+        from excel_dumper.dumper import excel_file_entries
+
+        for name in ["a.xlsx", "B.XLSM", "c.xls", ".hidden.xlsx", "notes.txt"]:
+            (tmp_path / name).touch()
+        (tmp_path / "folder.xlsx").mkdir()
+
+        names = sorted(entry.name for entry in excel_file_entries(str(tmp_path)))
+        assert names == ["B.XLSM", "a.xlsx", "c.xls"]
+        assert [entry.name for entry in excel_file_entries(str(tmp_path), ('.xls',))] == ["c.xls"]
+        print("✓ Excel file scan filters entries correctly")
+
+
+    def test_batch_process_workers_clamped_to_cpu_count(self, excel_file_factory, tmp_path, monkeypatch):
+        """Test that batch_process runs serially when only one CPU core is available."""
+        from excel_dumper import batch_process
+        
+        excel_file_factory("first.xlsx", {"Sheet1": [["a", 1]]})
+        excel_file_factory("second.xlsx", {"Sheet1": [["b", 2]]})
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        
+        monkeypatch.setattr(os, 'cpu_count', lambda: 1)
+        with patch('concurrent.futures.ProcessPoolExecutor') as mock_executor:
+            output_files = batch_process(str(tmp_path), str(output_dir), max_workers=8)
+        
+        mock_executor.assert_not_called()
+        assert len(output_files) == 2
+        print("✓ Batch workers clamped to CPU count")
+
+
 class TestGenerateOutputFilename:
     """Test the generate_output_filename function."""
     
@@ -152,6 +184,27 @@ class TestGenerateOutputFilename:
         print("✓ Filename collision handling works")
     
     
+    def test_generate_filename_collision_in_output_dir(self, tmp_path):
+        """Test that the first free counter is used when the output directory has many dumps."""
+        input_file = tmp_path / "test.xlsx"
+        input_file.touch()
+        output_dir = tmp_path / "exports"
+        
+        first_result = generate_output_filename(str(input_file), str(output_dir))
+        base = first_result[:-len(".csv")]
+        for suffix in ["", "(1)", "(3)"]:
+            Path(f"{base}{suffix}.csv").touch()
+        
+        result = generate_output_filename(str(input_file), str(output_dir))
+        
+        assert result == f"{base}(2).csv"
+        
+        # Reserved names count as taken before they exist on disk
+        reserved = {result, f"{base}(4).csv"}
+        assert generate_output_filename(str(input_file), str(output_dir), reserved=reserved) == f"{base}(5).csv"
+        print("✓ Filename collision in output directory works")
+    
+    
     def test_generate_filename_preserves_timestamp(self, tmp_path):
         """Test that filename includes file modification timestamp."""
         input_file = tmp_path / "test.xlsx"
@@ -164,6 +217,11 @@ class TestGenerateOutputFilename:
         
         # Should contain some timestamp-like content
         assert any(char.isdigit() for char in result)
+        
+        # Timestamp is the ISO 8601 modification time with colons replaced
+        from datetime import datetime
+        expected = datetime.fromtimestamp(mod_time).astimezone().isoformat().replace(':', '-')
+        assert result == f"dumperpy_test_{expected}.csv"
         print("✓ Timestamp preservation works")
 
 
@@ -240,6 +298,73 @@ class TestWriteToCSV:
         print("✓ CSV with special characters works")
     
     
+    def test_write_csv_from_generator(self, tmp_path):
+        """Test CSV writing from a row generator with ragged widths."""
+        test_data = (row for row in [
+            ['Sheet1', 'Name'],
+            ['Sheet1', 'John', 25, 'Extra']
+        ])
+        
+        output_file = tmp_path / "test_generator.csv"
+        write_to_csv(test_data, str(output_file))
+        
+        with open(output_file, 'r', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        
+        assert rows[0] == ['Worksheet', 'Column_1', 'Column_2', 'Column_3']
+        assert len(rows) == 3
+        print("✓ CSV from generator works")
+    
+    
+    def test_write_csv_with_known_width(self, tmp_path):
+        """Test CSV writing when the caller supplies the header width."""
+        test_data = (row for row in [
+            ['Sheet1', 'Name', 'Age'],
+            ['Sheet1', 'John', 25]
+        ])
+        
+        output_file = tmp_path / "test_known_width.csv"
+        row_count = write_to_csv(test_data, str(output_file), max_cols=3)
+        
+        with open(output_file, 'r', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        
+        assert row_count == 2
+        assert rows == [['Worksheet', 'Column_1', 'Column_2'], ['Sheet1', 'Name', 'Age'], ['Sheet1', 'John', '25']]
+        print("✓ CSV with known width works")
+    
+    
+    def test_write_csv_compressed(self, tmp_path):
+        """Test that compressed CSV output decompresses to the plain CSV output."""
+        zstandard = pytest.importorskip("zstandard")
+        test_data = [
+            ['Sheet1', 'Name', 'Age'],
+            ['Sheet1', 'Zoë', 25]
+        ]
+        
+        plain_file = tmp_path / "plain.csv"
+        compressed_file = tmp_path / "plain.csv.zst"
+        write_to_csv(test_data, str(plain_file))
+        write_to_csv((row for row in test_data), str(compressed_file), compress=True)
+        
+        with open(compressed_file, 'rb') as f:
+            decompressed = zstandard.ZstdDecompressor().stream_reader(f).read()
+        assert decompressed == plain_file.read_bytes()
+        print("✓ Compressed CSV writing works")
+    
+    
+    def test_write_csv_compress_requires_zstandard(self, tmp_path, monkeypatch):
+        """Test that compressed output reports the missing zstandard package."""
+        from excel_dumper import dumper
+        
+        monkeypatch.setattr(dumper, 'ZSTANDARD_AVAILABLE', False)
+        with pytest.raises(Exception) as exc_info:
+            write_to_csv([['Sheet1', 'Data']], str(tmp_path / "test.csv.zst"), compress=True)
+        
+        assert "zstandard" in str(exc_info.value)
+        print("✓ Missing zstandard reported correctly")
+    
+    
     def test_write_csv_empty_data(self, tmp_path):
         """Test CSV writing with empty data."""
         test_data = []
@@ -339,6 +464,73 @@ class TestWriteToJSON:
         print("✓ JSON null value exclusion works")
     
     
+    def test_write_json_encoders_match(self, tmp_path, monkeypatch):
+        """Test that orjson (when installed) and stdlib json write identical files."""
+        from datetime import date, datetime
+        from excel_dumper import dumper
+        
+        test_data = [
+            ['Sheet1', 'Name', 'Date', 'Stamp'],
+            ['Sheet1', 'Zoë', date(2024, 1, 2), datetime(2024, 1, 2, 3, 4, 5)],
+            ['Sheet1', 1.5, 42, True],
+            # Floats orjson would format differently: exponents and non-finite values
+            ['Sheet1', 1e16, 1e-7, float('inf'), float('-inf'), float('nan')]
+        ]
+        
+        default_file = tmp_path / "default.json"
+        stdlib_file = tmp_path / "stdlib.json"
+        write_to_json(test_data, str(default_file))
+        monkeypatch.setattr(dumper, 'ORJSON_AVAILABLE', False)
+        write_to_json(test_data, str(stdlib_file))
+        
+        assert default_file.read_bytes() == stdlib_file.read_bytes()
+        
+        # NaN cells are dropped before encoding, so check the encoder on its own too
+        record = {'Column_1': float('nan'), 'Column_2': 1e16}
+        stdlib_bytes = dumper.encode_json_record(record)
+        monkeypatch.undo()  # restore ORJSON_AVAILABLE
+        assert dumper.encode_json_record(record) == stdlib_bytes
+        print("✓ JSON encoders produce identical output")
+    
+    
+    def test_write_json_from_generator(self, tmp_path):
+        """Test that streamed rows produce the same file as a single json.dump."""
+        test_data = [
+            ['Sheet1', 1, 'Name', None],
+            ['Sheet1', 2, 'Multi\nline', '', 3.5, 'Wide'],
+            ['Sheet2', 1, None]
+        ]
+        
+        output_file = tmp_path / "streamed.json"
+        write_to_json((row for row in test_data), str(output_file), include_row_numbers=True)
+        
+        expected = [
+            {'Worksheet': 'Sheet1', 'Row_Number': 1, 'Column_1': 'Name'},
+            {'Worksheet': 'Sheet1', 'Row_Number': 2, 'Column_1': 'Multi\nline',
+             'Column_3': 3.5, 'Column_4': 'Wide'},
+            {'Worksheet': 'Sheet2', 'Row_Number': 1}
+        ]
+        assert output_file.read_text(encoding='utf-8') == json.dumps(expected, indent=2, ensure_ascii=False)
+        
+        write_to_json(iter([]), str(output_file))
+        assert output_file.read_text(encoding='utf-8') == '[]'
+        print("✓ JSON writing from generator works")
+    
+    
+    def test_is_json_value_filters_nulls(self):
+        """Test the per-cell filter used by write_to_json."""
+        import math
+        from datetime import date
+        from excel_dumper.dumper import is_json_value
+        
+        for value in [None, '', '   ', 'nan', 'NaN', math.nan]:
+            assert is_json_value(value) == False, repr(value)
+        for value in ['x', 0, 0.0, False, date(2024, 1, 1)]:
+            assert is_json_value(value) == True, repr(value)
+        
+        print("✓ JSON value filter works")
+    
+    
     def test_write_json_unicode_content(self, tmp_path):
         """Test JSON writing with unicode content."""
         test_data = [
@@ -521,6 +713,22 @@ class TestFileOperationsPerformance:
         print(f"✓ CSV performance test: {len(test_data)} rows in {duration:.2f}s")
     
     
+    def test_has_non_null_data_performance(self):
+        """Test has_non_null_data stays fast on mostly-empty rows."""
+        import time
+        
+        rows = [[None] * 20, [None] * 19 + ['x'], ['', '  ', None, 0], ['value'] + [None] * 19] * 25000
+        
+        start_time = time.time()
+        results = [has_non_null_data(row) for row in rows]
+        duration = time.time() - start_time
+        
+        assert results[:4] == [False, True, True, True]
+        assert duration < 5.0, f"Null check took {duration:.2f}s, expected < 5s"
+        
+        print(f"✓ has_non_null_data performance: {len(rows)} rows in {duration:.2f}s")
+    
+    
     def test_find_newest_performance_many_files(self, tmp_path):
         """Test find_newest_excel_file performance with many files."""
         import time
@@ -164,13 +164,14 @@ class TestTargetedCoverage:
         print("✓ Formula processing edge cases tested")
     
     
-    @patch('json.dump')
-    def test_json_writing_lines_212_219(self, mock_json_dump):
+    @patch('excel_dumper.dumper.ORJSON_AVAILABLE', False)
+    @patch('json.dumps')
+    def test_json_writing_lines_212_219(self, mock_json_dumps):
         """Target lines 212, 219: JSON writing edge cases."""
         from excel_dumper.dumper import write_to_json
         
-        # Mock json.dump to raise errors
-        mock_json_dump.side_effect = Exception("JSON writing error")
+        # Mock json.dumps to raise errors
+        mock_json_dumps.side_effect = Exception("JSON writing error")
         
         test_data = [['Sheet1', 'Test', 'Data']]
         
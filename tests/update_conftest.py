@@ -9,12 +9,7 @@ from pathlib import Path
 def update_conftest():
     """Replace conftest.py with the version that has all required fixtures."""
     
-    # Backup existing conftest.py if it exists
     conftest_path = Path("conftest.py")
-    if conftest_path.exists():
-        backup_path = Path("conftest.py.backup")
-        shutil.copy2(conftest_path, backup_path)
-        print(f"✓ Backed up existing conftest.py to {backup_path}")
     
     # Create the new conftest.py with all fixtures
     conftest_content = '''"""
@@ -265,8 +260,22 @@ def pytest_configure(config):
     FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
 '''
     
-    with open("conftest.py", "w", encoding="utf-8") as f:
-        f.write(conftest_content)
+    try:
+        current_content = conftest_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        current_content = None
+    
+    if current_content == conftest_content:
+        print("✓ conftest.py already up to date")
+        return
+    
+    # Backup existing conftest.py if it exists
+    if current_content is not None:
+        backup_path = Path("conftest.py.backup")
+        shutil.copy2(conftest_path, backup_path)
+        print(f"✓ Backed up existing conftest.py to {backup_path}")
+    
+    conftest_path.write_text(conftest_content, encoding="utf-8")
     
     print("✓ Updated conftest.py with all required fixtures")
     print("✓ Test fixtures will be created automatically when tests run")